@@ -0,0 +1,184 @@
+import numpy as np
+
+# Códigos de BoxStatus (storage.jl)
+STATUS_CODES = {"waiting": 0, "taken": 1, "delivered": 2}
+STATUS_WAITING, STATUS_TAKEN, STATUS_DELIVERED = 0, 1, 2
+STATUS_UNKNOWN = -1
+
+# Orientaciones del servidor
+ORIENT_UP, ORIENT_LEFT, ORIENT_DOWN, ORIENT_RIGHT = 0, 1, 2, 3
+# Giro: +1 a la izquierda, -1 a la derecha, 0 ninguno
+TURN_LEFT, TURN_RIGHT, NO_TURN = 1, -1, 0
+TURN_NAMES = {ORIENT_UP: "Y+", ORIENT_LEFT: "X-", ORIENT_DOWN: "Y-", ORIENT_RIGHT: "X+"}
+
+class EntityStore:
+    """Estado de un tipo de agente como arreglos NumPy (estructura de arreglos).
+
+    Cada agente ocupa una fila, asignada por su id del servidor la primera
+    vez que aparece; las actualizaciones se escriben de forma vectorizada.
+    Los ids se buscan con np.searchsorted sobre un arreglo ordenado, y si
+    llegan los mismos ids que la vez anterior se reusan sus filas. Los
+    arreglos sólo crecen al aparecer agentes nuevos, así que la memoria no
+    aumenta con el tiempo.
+    """
+
+    def __init__(self, color=(1.0, 1.0, 1.0), scale=1.0, rotationStep=10, capacity=16):
+        self.defaultColor = np.array(color, dtype=np.float32)
+        self.defaultScale = scale
+        self.rotationStep = rotationStep
+        self.size = 0
+        # Ids conocidos ordenados y la fila de cada uno
+        self.sortedIds = np.zeros(0, dtype=np.int64)
+        self.sortedRows = np.zeros(0, dtype=np.int64)
+        # Último arreglo de ids y sus filas (de sólo lectura)
+        self.lastIds = None
+        self.lastRows = None
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        old = getattr(self, "pos", None)
+        fields = {
+            "ids": np.zeros(capacity, dtype=np.int64),
+            "pos": np.zeros((capacity, 2), dtype=np.float64),
+            "orientation": np.zeros(capacity, dtype=np.int8),
+            "dx": np.zeros(capacity, dtype=np.int8),
+            "dy": np.zeros(capacity, dtype=np.int8),
+            "counter": np.zeros(capacity, dtype=np.int64),
+            "status": np.full(capacity, STATUS_UNKNOWN, dtype=np.int8),
+            "color": np.tile(self.defaultColor, (capacity, 1)),
+            "theta": np.zeros(capacity, dtype=np.float64),
+            "scale": np.full(capacity, self.defaultScale, dtype=np.float64),
+            "remRotation": np.zeros(capacity, dtype=np.int64),
+            "deltaTheta": np.full(capacity, self.rotationStep, dtype=np.int64),
+        }
+        for name, array in fields.items():
+            if old is not None:
+                array[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.size
+
+    def rowsFor(self, agents):
+        """Filas de los agentes (por "id", o por posición si no hay id)."""
+        return self.rowsForIds([agent.get("id", i) for i, agent in enumerate(agents)])
+
+    def rowsForIds(self, ids):
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        if self.lastIds is not None and np.array_equal(ids, self.lastIds):
+            return self.lastRows
+
+        index = np.searchsorted(self.sortedIds, ids)
+        index[index == len(self.sortedIds)] = 0
+        known = self.sortedIds[index] == ids if len(self.sortedIds) else np.zeros(len(ids), dtype=bool)
+        rows = np.empty(len(ids), dtype=np.int64)
+        rows[known] = self.sortedRows[index[known]]
+
+        if not known.all():
+            # Agentes nuevos, en el orden en que aparecen
+            newIds, first, inverse = np.unique(ids[~known], return_index=True, return_inverse=True)
+            order = np.argsort(first, kind="stable")
+            count = len(newIds)
+            while self.size + count > self.capacity:
+                self.allocate(max(16, 2 * self.capacity))
+            newRows = np.empty(count, dtype=np.int64)
+            newRows[order] = self.size + np.arange(count)
+            self.ids[newRows] = newIds
+            self.size += count
+            rows[~known] = newRows[inverse.reshape(-1)]
+            self.sortedIds = np.concatenate([self.sortedIds, newIds])
+            self.sortedRows = np.concatenate([self.sortedRows, newRows])
+            sort = np.argsort(self.sortedIds, kind="stable")
+            self.sortedIds, self.sortedRows = self.sortedIds[sort], self.sortedRows[sort]
+
+        rows.flags.writeable = False
+        self.lastIds, self.lastRows = ids.copy(), rows
+        return rows
+
+    def load(self, agents):
+        """Escribe de una vez la lista de agentes del servidor; regresa sus filas.
+
+        También acepta las columnas de un snapshot binario (Snapshot.decode).
+        """
+        if isinstance(agents, dict):
+            return self.loadArrays(**agents)
+        if not agents:
+            return self.rowsForIds([])
+        first = agents[0]
+        return self.loadArrays(
+            [agent.get("id", i) for i, agent in enumerate(agents)],
+            [agent["pos"][:2] for agent in agents],
+            orientation=[agent["orientation"] for agent in agents] if "orientation" in first else None,
+            dx=[agent["dx"] for agent in agents] if "dx" in first else None,
+            dy=[agent["dy"] for agent in agents] if "dy" in first else None,
+            counter=[agent["counter"] for agent in agents] if "counter" in first else None,
+            status=[
+                STATUS_CODES.get(agent["status"], STATUS_UNKNOWN) for agent in agents
+            ] if "status" in first else None
+        )
+
+    def loadArrays(self, ids, pos, orientation=None, dx=None, dy=None, counter=None, status=None):
+        """Como load, pero con arreglos ya armados (p. ej. de un Trace); status en códigos."""
+        rows = self.rowsForIds(ids)
+        if not len(rows):
+            return rows
+        self.pos[rows] = pos
+        for name, values in (("orientation", orientation), ("dx", dx), ("dy", dy),
+                             ("counter", counter), ("status", status)):
+            if values is not None:
+                getattr(self, name)[rows] = values
+        return rows
+
+    def turn(self, rows=None):
+        """Máquina de giros de display() sobre todos los robots a la vez.
+
+        Regresa (filas que giran, orientación nueva). Un giro de 90 grados
+        sólo arranca si no hay otro pendiente, pero la orientación del
+        cliente cambia de todos modos.
+        """
+        rows = np.arange(self.size) if rows is None else rows
+        orientation = self.orientation[rows]
+        dx, dy = self.dx[rows], self.dy[rows]
+        up = orientation == ORIENT_UP
+        left = orientation == ORIENT_LEFT
+        down = orientation == ORIENT_DOWN
+        right = orientation == ORIENT_RIGHT
+        # Mismo orden que los if/elif: la primera condición que se cumple gana
+        conditions = [
+            up & (dx == 1), up & (dx == -1), up & (dy == -1),
+            left & (dy == 1), left & (dy == -1),
+            down & (dx == 1), down & (dx == -1), down & (dy == 1),
+            right & (dy == 1), right & (dy == -1),
+        ]
+        turns = [
+            TURN_RIGHT, TURN_LEFT, TURN_RIGHT,
+            TURN_RIGHT, TURN_LEFT,
+            TURN_LEFT, TURN_RIGHT, TURN_RIGHT,
+            TURN_LEFT, TURN_RIGHT,
+        ]
+        targets = [
+            ORIENT_RIGHT, ORIENT_LEFT, ORIENT_DOWN,
+            ORIENT_UP, ORIENT_DOWN,
+            ORIENT_RIGHT, ORIENT_LEFT, ORIENT_UP,
+            ORIENT_UP, ORIENT_DOWN,
+        ]
+        direction = np.select(conditions, turns, NO_TURN)
+        direction[self.counter[rows] == 0] = NO_TURN
+        moving = direction != NO_TURN
+        turning = rows[moving]
+        newOrientation = np.select(conditions, targets, 0)[moving]
+
+        idle = self.remRotation[turning] == 0
+        start = turning[idle]
+        self.remRotation[start] = 90
+        self.deltaTheta[start] = self.rotationStep * direction[moving][idle]
+        self.orientation[turning] = newOrientation
+        return turning, newOrientation
+
+    def update(self, rows=None):
+        """Avanza un paso (rotationStep grados) la animación de giro."""
+        rows = np.arange(self.size) if rows is None else rows
+        rotating = rows[self.remRotation[rows] > 0]
+        self.theta[rotating] += self.deltaTheta[rotating]
+        self.remRotation[rotating] -= self.rotationStep
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import Snapshot
+from FrameStats import FrameStats, SUMMARY
+
+def decode_response(response):
+    """Snapshot binario o JSON, según el Content-Type de la respuesta."""
+    if response.headers.get("Content-Type", "").startswith(Snapshot.CONTENT_TYPE):
+        return Snapshot.decode(response.content)
+    return response.json()
+
+class Fetcher:
+    """Pide el estado de la simulación en un hilo aparte.
+
+    Usa una requests.Session con conexiones keep-alive y no pide más de
+    una vez cada interval segundos. Cada respuesta decodificada se escribe
+    en el búfer trasero y se publica cambiando el índice del frontal, una
+    asignación atómica, así que el ciclo de render toma la última con
+    take() sin candados y un servidor lento nunca lo detiene. Junto con
+    cada respuesta se publica cuánto tardó la red y cuánto la
+    decodificación; take() los deja en timings. Con binary=True pide el
+    formato binario (Snapshot.decode, sin copias) y si el servidor
+    contesta JSON lo decodifica como antes. Con recorder (un TraceWriter)
+    cada respuesta se graba en el hilo del Fetcher, también las que el
+    render reemplaza en el búfer antes de tomarlas.
+    """
+
+    def __init__(self, url, interval=0.5, timeout=5.0, session=None, binary=False, stats=None,
+                 recorder=None):
+        self.url = url
+        self.recorder = recorder
+        # Sólo para log(); los tiempos se publican con cada respuesta
+        self.stats = stats or FrameStats(enabled=False)
+        self.headers = {"Accept": Snapshot.CONTENT_TYPE} if binary else {}
+        self.interval = interval
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        # Doble búfer: (número de secuencia, datos, (red, decodificación))
+        self.buffers = [(0, None, (0.0, 0.0)), (0, None, (0.0, 0.0))]
+        self.front = 0
+        self.taken = 0
+        self.timings = (0.0, 0.0)
+        self.fetches = 0
+        self.errors = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="Fetcher", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self.stopped.set()
+        self.thread.join(timeout)
+        self.session.close()
+
+    def fetch(self):
+        """Regresa (datos, (segundos de red, segundos de decodificación))."""
+        try:
+            start = time.perf_counter()
+            response = self.session.get(self.url, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
+            received = time.perf_counter()
+            data = decode_response(response)
+            return data, (received - start, time.perf_counter() - received)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.errors += 1
+            self.stats.log(SUMMARY, f"Error updating data: {e}")
+            return None, (0.0, 0.0)
+
+    def publish(self, data, timings=(0.0, 0.0)):
+        sequence = self.buffers[self.front][0] + 1
+        back = 1 - self.front
+        self.buffers[back] = (sequence, data, timings)
+        self.front = back
+
+    def run(self):
+        while not self.stopped.is_set():
+            start = time.monotonic()
+            data, timings = self.fetch()
+            self.fetches += 1
+            if data is not None:
+                if self.recorder:
+                    self.recorder.write(data)
+                self.publish(data, timings)
+            # Límite de frecuencia: espera lo que falte del intervalo
+            self.stopped.wait(max(0.0, self.interval - (time.monotonic() - start)))
+
+    def take(self):
+        """Regresa la respuesta más nueva que no se haya tomado, o None."""
+        sequence, data, timings = self.buffers[self.front]
+        if sequence == self.taken:
+            return None
+        self.taken = sequence
+        self.timings = timings
+        return data
@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+# Niveles de verbosidad de log()
+QUIET, SUMMARY, DEBUG = 0, 1, 2
+# Fases que se reportan primero, en el orden del ciclo
+PHASES = ("network", "decode", "update", "transform", "rasterize", "flip", "frame")
+
+NULL_PHASE = nullcontext()
+
+class Phase:
+    """Cronometra un bloque with y suma el tiempo a la fase."""
+
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = self.stats.clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add(self.name, self.stats.clock() - self.start)
+        return False
+
+class FrameStats:
+    """Tiempos por fase, histogramas móviles y contadores del cliente.
+
+    Lo medido con phase() o add() se suma durante el cuadro y endFrame()
+    lo guarda en un búfer circular de las últimas window muestras por
+    fase. Con enabled=False phase() regresa un contexto vacío y nada se
+    mide. Si se da path, cada exportEvery segundos se escribe el resumen
+    en CSV (una fila por fase) o JSON, según la extensión. log() sustituye
+    los print de depuración: sólo imprime si level <= verbosity.
+    """
+
+    def __init__(self, enabled=True, verbosity=QUIET, window=240, path=None,
+                 exportEvery=5.0, clock=time.perf_counter):
+        self.enabled = enabled
+        self.verbosity = verbosity
+        self.window = window
+        self.path = path
+        self.exportEvery = exportEvery
+        self.clock = clock
+        self.samples = {}
+        self.totals = {}
+        self.current = {}
+        self.counters = {}
+        self.frames = 0
+        self.frameStart = None
+        self.lastExport = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return Phase(self, name)
+
+    def add(self, name, seconds):
+        """Suma seconds a la fase name del cuadro actual."""
+        if self.enabled:
+            self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def log(self, level, *args):
+        if level <= self.verbosity:
+            print(*args)
+
+    def record(self, name, seconds):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = np.zeros(self.window)
+            self.totals[name] = 0
+        samples[self.totals[name] % self.window] = seconds
+        self.totals[name] += 1
+
+    def endFrame(self, now=None):
+        """Cierra el cuadro: guarda sus fases y el tiempo total del cuadro."""
+        if not self.enabled:
+            return
+        now = self.clock() if now is None else now
+        if self.frameStart is not None:
+            self.current["frame"] = now - self.frameStart
+        self.frameStart = now
+        for name, seconds in self.current.items():
+            self.record(name, seconds)
+        self.current = {}
+        self.frames += 1
+
+        if self.path is not None:
+            if self.lastExport is None:
+                self.lastExport = now
+            elif now - self.lastExport >= self.exportEvery:
+                self.export()
+                self.lastExport = now
+
+    def values(self, name):
+        """Las muestras de la ventana móvil, en segundos."""
+        samples = self.samples.get(name)
+        if samples is None:
+            return np.zeros(0)
+        return samples[:min(self.totals[name], self.window)]
+
+    def histogram(self, name, bins=10):
+        """Histograma (conteos, bordes en ms) de la ventana móvil."""
+        return np.histogram(self.values(name) * 1000.0, bins=bins)
+
+    def names(self):
+        known = [name for name in PHASES if name in self.samples]
+        return known + sorted(name for name in self.samples if name not in PHASES)
+
+    def summary(self):
+        """Por fase: muestras totales y media, p50, p95 y máximo en ms."""
+        result = {}
+        for name in self.names():
+            values = self.values(name) * 1000.0
+            p50, p95 = np.percentile(values, [50, 95])
+            result[name] = {
+                'count': self.totals[name],
+                'mean_ms': float(values.mean()),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'max_ms': float(values.max()),
+            }
+        return result
+
+    def fps(self):
+        frame = self.values("frame")
+        return 1.0 / frame.mean() if len(frame) and frame.mean() > 0 else 0.0
+
+    def overlayLines(self):
+        """Texto corto para dibujar encima de la escena."""
+        lines = ["fps {:6.1f}".format(self.fps())]
+        for name, row in self.summary().items():
+            lines.append("{:<10}{:7.2f} ms  p95 {:7.2f}".format(name, row['mean_ms'], row['p95_ms']))
+        for name in sorted(self.counters):
+            lines.append("{:<10}{:>7}".format(name, self.counters[name]))
+        return lines
+
+    def export(self, path=None):
+        path = path or self.path
+        stamp = time.time()
+        summary = self.summary()
+        if os.path.splitext(path)[1].lower() == ".json":
+            with open(path, "w") as f:
+                json.dump({
+                    'time': stamp,
+                    'frames': self.frames,
+                    'phases': summary,
+                    'counters': self.counters,
+                    'histograms': {
+                        name: [values.tolist() for values in self.histogram(name)]
+                        for name in summary
+                    },
+                }, f, indent=2)
+            return
+        fields = ['time', 'phase', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms']
+        header = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            if header:
+                writer.writeheader()
+            for name, row in summary.items():
+                writer.writerow(dict(row, time=stamp, phase=name))
+            for name, value in self.counters.items():
+                writer.writerow({'time': stamp, 'phase': name, 'count': value})
@@ -0,0 +1,243 @@
+import ctypes
+import numpy as np
+
+# Cargamos las bibliotecas de OpenGL
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+
+from FrameStats import FrameStats
+from Raster import POINT_SIZE
+
+# Por instancia: x, y, ángulo (radianes), escala, r, g, b
+INSTANCE_FIELDS = 7
+
+VERTEX_SHADER = """
+#version 120
+attribute vec3 vertex;
+attribute vec4 instance;
+attribute vec3 color;
+uniform mat3 world;
+varying vec3 fragColor;
+
+void main() {
+    float c = cos(instance.z);
+    float s = sin(instance.z);
+    vec2 local = instance.w * vertex.xy;
+    vec2 rotated = vec2(c * local.x - s * local.y, s * local.x + c * local.y);
+    // La tercera coordenada del modelo pesa la traslación, como en OpMat
+    vec3 p = world * vec3(rotated + vertex.z * instance.xy, vertex.z);
+    // Redondeo a unidades enteras: un DDA, que se parece a Bresenham pero no es igual
+    gl_Position = gl_ModelViewProjectionMatrix * vec4(floor(p.xy + 0.5), 0.0, 1.0);
+    fragColor = color;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 120
+varying vec3 fragColor;
+
+void main() {
+    gl_FragColor = vec4(fragColor, 1.0);
+}
+"""
+
+class Shape:
+    """Geometría compartida: puntos (N,3) y aristas (E,2), definida una vez."""
+
+    def __init__(self, name, points, edges):
+        self.name = name
+        self.points = np.array(points, dtype=np.float64)
+        self.points.flags.writeable = False
+        self.edges = np.array(edges, dtype=np.int64).reshape(-1, 2)
+        self.edges.flags.writeable = False
+        starts = self.points[self.edges[:, 0], :2]
+        ends = self.points[self.edges[:, 1], :2]
+        self.edgeLength = float(np.abs(ends - starts).max()) if len(self.edges) else 0.0
+        # OpMat y el shader multiplican la traslación por la tercera
+        # coordenada de los puntos: una instancia en pos queda en pos*weight
+        self.weight = float(self.points[0, 2]) if len(self.points) else 1.0
+        # VBO de puntos sobre las aristas por número de muestras
+        self.vbos = {}
+
+    def edgeVertices(self, samples):
+        """samples puntos por arista (E*samples,3) en coordenadas del modelo."""
+        t = np.linspace(0.0, 1.0, samples)[None, :, None]
+        starts = self.points[self.edges[:, 0], None, :]
+        ends = self.points[self.edges[:, 1], None, :]
+        return np.ascontiguousarray((starts + t * (ends - starts)).reshape(-1, 3), dtype=np.float32)
+
+    def samplesFor(self, scale):
+        """Muestras por arista para que dos seguidas disten a lo más una unidad.
+
+        Se redondea a una potencia de dos (más uno) para reutilizar VBOs.
+        """
+        needed = max(1, int(np.ceil(self.edgeLength * scale)))
+        return (1 << (needed - 1).bit_length()) + 1
+
+# Registro de figuras por nombre
+SHAPES = {}
+
+def register(name, points, edges):
+    """Registra una figura; si ya existe regresa la misma."""
+    if name not in SHAPES:
+        SHAPES[name] = Shape(name, points, edges)
+    return SHAPES[name]
+
+class InstancedRenderer:
+    """Dibuja todas las instancias de cada figura con un solo draw instanciado.
+
+    Cada cuadro sólo se sube un arreglo compacto por figura (posición,
+    ángulo, escala y color), así que el costo depende del número de
+    figuras y no del número de entidades. Sin shaders o sin instancing se
+    usa el camino en CPU: OpMat.transformObjects y Raster, que dibuja los
+    mismos pixeles que Bresenham; con un TransformCache las poses que no
+    cambiaron no se recalculan.
+
+    Los dos caminos dibujan puntos de POINT_SIZE sobre las aristas, pero
+    no los mismos pixeles: en GPU cada arista se muestrea con al menos un
+    punto por unidad y se redondea a unidades enteras (un DDA), no con
+    Bresenham. Es una aproximación; cada punto de un camino queda a lo
+    más a una unidad de algún punto del otro, menos que el tamaño del
+    punto (lo verifica test_geometry.py).
+    """
+
+    def __init__(self, opera, raster, cache=None, stats=None):
+        self.opera = opera
+        self.raster = raster
+        self.cache = cache
+        # Tiempos de las fases transform y rasterize
+        self.stats = stats or FrameStats(enabled=False)
+        self.instanced = None
+        self.program = None
+        self.instanceVbo = None
+        self.instances = {}
+
+    def add(self, shape, pos, theta, scale, colors):
+        """Agrega K instancias: pos (K,2), theta en grados, scale y colors (K,3)."""
+        pos = np.asarray(pos, dtype=np.float64).reshape(-1, 2)
+        self.instances.setdefault(shape.name, (shape, []))[1].append((
+            pos,
+            np.broadcast_to(np.asarray(theta, dtype=np.float64), len(pos)),
+            np.broadcast_to(np.asarray(scale, dtype=np.float64), len(pos)),
+            np.broadcast_to(np.asarray(colors, dtype=np.float64), (len(pos), 3))
+        ))
+
+    def addSprites(self, pos, colors):
+        """Agrega un punto por instancia (nivel de detalle barato)."""
+        self.raster.addPixels(pos, colors)
+
+    def setup(self):
+        try:
+            self.program = shaders.compileProgram(
+                shaders.compileShader(VERTEX_SHADER, GL_VERTEX_SHADER),
+                shaders.compileShader(FRAGMENT_SHADER, GL_FRAGMENT_SHADER)
+            )
+            self.instanced = bool(glDrawArraysInstanced) and bool(glVertexAttribDivisor)
+        except Exception:
+            self.instanced = False
+        if self.instanced:
+            self.instanceVbo = glGenBuffers(1)
+            self.locations = {
+                name: glGetAttribLocation(self.program, name)
+                for name in ("vertex", "instance", "color")
+            }
+            self.worldLocation = glGetUniformLocation(self.program, "world")
+
+    def upload(self, shape, samples):
+        # La geometría de cada figura se sube una vez por número de muestras
+        vbo = shape.vbos.get(samples)
+        if vbo is None:
+            vertices = shape.edgeVertices(samples)
+            vbo = shape.vbos[samples] = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        return vbo
+
+    def instanceData(self, batches):
+        pos = np.concatenate([batch[0] for batch in batches])
+        theta = np.concatenate([batch[1] for batch in batches])
+        scale = np.concatenate([batch[2] for batch in batches])
+        colors = np.concatenate([batch[3] for batch in batches])
+        return pos, theta, scale, colors
+
+    def drawCached(self, shape, batches):
+        pos, theta, scale, colors = self.instanceData(batches)
+        results = self.cache.transform(self.opera, shape, pos, theta, scale)
+        pixels = [result[1] for result in results]
+        self.raster.addPixels(
+            np.concatenate(pixels) if pixels else np.zeros((0, 2)),
+            np.repeat(colors, [len(objectPixels) for objectPixels in pixels], axis=0)
+        )
+
+    def draw(self, present=True):
+        """Dibuja lo agregado; con present=False sólo transforma y rasteriza en CPU."""
+        if self.instanced is None and present:
+            self.setup()
+        instances, self.instances = self.instances, {}
+
+        if not self.instanced or not present:
+            with self.stats.phase("transform"):
+                for shape, batches in instances.values():
+                    if self.cache is not None:
+                        self.drawCached(shape, batches)
+                        continue
+                    pos, theta, scale, colors = self.instanceData(batches)
+                    pointsR = self.opera.transformObjects(
+                        shape.points, pos[:, 0], pos[:, 1], theta, scale, scale
+                    )
+                    self.raster.addEdges(
+                        pointsR[:, shape.edges[:, 0]], pointsR[:, shape.edges[:, 1]],
+                        np.repeat(colors, len(shape.edges), axis=0)
+                    )
+            with self.stats.phase("rasterize"):
+                self.raster.draw(present)
+            return
+
+        # En GPU el vertex shader hace la transformación
+        with self.stats.phase("transform"):
+            self.drawInstanced(instances)
+        # Puntos de nivel de detalle en la misma pasada
+        with self.stats.phase("rasterize"):
+            self.raster.draw()
+
+    def drawInstanced(self, instances):
+        glUseProgram(self.program)
+        world = self.opera.currentMatrix
+        glUniformMatrix3fv(self.worldLocation, 1, GL_TRUE, world.astype(np.float32))
+        # Cuánto puede alargar la matriz de mundo una arista
+        worldScale = np.abs(world[:2, :2]).sum(axis=0).max()
+        glPointSize(POINT_SIZE)
+        vertex = self.locations["vertex"]
+        instance = self.locations["instance"]
+        color = self.locations["color"]
+        stride = INSTANCE_FIELDS * 4
+
+        for shape, batches in instances.values():
+            pos, theta, scale, colors = self.instanceData(batches)
+            data = np.empty((len(pos), INSTANCE_FIELDS), dtype=np.float32)
+            data[:, 0:2] = pos
+            data[:, 2] = np.radians(theta)
+            data[:, 3] = scale
+            data[:, 4:7] = colors
+
+            samples = shape.samplesFor(scale.max() * worldScale)
+            glBindBuffer(GL_ARRAY_BUFFER, self.upload(shape, samples))
+            glEnableVertexAttribArray(vertex)
+            glVertexAttribPointer(vertex, 3, GL_FLOAT, GL_FALSE, 0, None)
+            glVertexAttribDivisor(vertex, 0)
+
+            glBindBuffer(GL_ARRAY_BUFFER, self.instanceVbo)
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+            glEnableVertexAttribArray(instance)
+            glVertexAttribPointer(instance, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+            glVertexAttribDivisor(instance, 1)
+            glEnableVertexAttribArray(color)
+            glVertexAttribPointer(color, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(16))
+            glVertexAttribDivisor(color, 1)
+
+            glDrawArraysInstanced(GL_POINTS, 0, len(shape.edges) * samples, len(pos))
+
+        for location in (vertex, instance, color):
+            glDisableVertexAttribArray(location)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
@@ -3,50 +3,103 @@ import numpy as np
 
 from pygame.locals import *
 
+# Profundidad máxima de la pila de matrices
+STACK_DEPTH = 32
+
 class OpMat():
     def __init__(self):
-        self.currentMatrix = np.identity(3)  
-        self.matrixStack = []
+        self.currentMatrix = np.identity(3)
+        # Pila preasignada: push y pop sólo copian dentro de este arreglo
+        self.matrixStack = np.empty((STACK_DEPTH, 3, 3))
+        self.stackSize = 0
+        # Matrices de trabajo para componer sin crear arreglos nuevos
+        self.opMatrix = np.identity(3)
+        self.resultMatrix = np.empty((3, 3))
+
+    def compose(self):
+        # currentMatrix = currentMatrix @ opMatrix, reusando los buffers
+        np.matmul(self.currentMatrix, self.opMatrix, out=self.resultMatrix)
+        self.currentMatrix, self.resultMatrix = self.resultMatrix, self.currentMatrix
 
     def translate(self, tx, ty):
-        translationMatrix = [[1, 0, tx],
-                             [0, 1, ty],
-                             [0, 0, 1]]
-        self.currentMatrix = np.matmul(self.currentMatrix, translationMatrix)
-        
+        m = self.opMatrix
+        m[0, 0], m[0, 1], m[0, 2] = 1, 0, tx
+        m[1, 0], m[1, 1], m[1, 2] = 0, 1, ty
+        self.compose()
+
     def rotate(self, deg):
         radians = math.radians(deg)
-        rotationMatrix = [[math.cos(radians), -math.sin(radians), 0],
-                          [math.sin(radians), math.cos(radians), 0],
-                          [0, 0, 1]]
-        self.currentMatrix = np.matmul(self.currentMatrix, rotationMatrix)
-        
+        m = self.opMatrix
+        m[0, 0], m[0, 1], m[0, 2] = math.cos(radians), -math.sin(radians), 0
+        m[1, 0], m[1, 1], m[1, 2] = math.sin(radians), math.cos(radians), 0
+        self.compose()
+
     def scale(self, sx, sy):
-        scaleMatrix = [[sx, 0, 0],
-                       [0, sy, 0],
-                       [0, 0, 1]]
-        self.currentMatrix = np.matmul(self.currentMatrix, scaleMatrix)
-        
-    def mult_Points(self, points):
-        pointsNew = [np.matmul(self.currentMatrix, point) for point in points]
-        pointsNew = [point[:-1] for point in pointsNew]
-        return pointsNew
-    
+        m = self.opMatrix
+        m[0, 0], m[0, 1], m[0, 2] = sx, 0, 0
+        m[1, 0], m[1, 1], m[1, 2] = 0, sy, 0
+        self.compose()
+
+    def mult_Points(self, points, out=None):
+        """Transforma un arreglo (N,3) de puntos y regresa (N,2) con x, y."""
+        points = np.asarray(points, dtype=np.float64)
+        pointsNew = np.matmul(points, self.currentMatrix.T)
+        if out is None:
+            return pointsNew[:, :-1]
+        out[...] = pointsNew[:, :-1]
+        return out
+
+    def objectMatrices(self, tx, ty, deg, sx, sy):
+        """Matrices (K,3,3) de K objetos: actual @ T(tx,ty) @ R(deg) @ S(sx,sy).
+
+        Cada argumento es un escalar o un arreglo de K valores; es lo mismo
+        que push, translate, rotate, scale y pop para cada objeto.
+        """
+        tx, ty, deg, sx, sy = np.broadcast_arrays(
+            *[np.asarray(value, dtype=np.float64) for value in (tx, ty, deg, sx, sy)]
+        )
+        radians = np.radians(deg)
+        cos, sin = np.cos(radians), np.sin(radians)
+        matrices = np.zeros(tx.shape + (3, 3))
+        matrices[..., 0, 0] = cos * sx
+        matrices[..., 0, 1] = -sin * sy
+        matrices[..., 0, 2] = tx
+        matrices[..., 1, 0] = sin * sx
+        matrices[..., 1, 1] = cos * sy
+        matrices[..., 1, 2] = ty
+        matrices[..., 2, 2] = 1
+        return np.matmul(self.currentMatrix, matrices)
+
+    def mult_Points_batch(self, points, matrices):
+        """Aplica K matrices (K,3,3) a los mismos puntos (N,3); regresa (K,N,2)."""
+        points = np.asarray(points, dtype=np.float64)
+        pointsNew = np.matmul(points, np.swapaxes(matrices, -1, -2))
+        return pointsNew[..., :-1]
+
+    def transformObjects(self, points, tx, ty, deg, sx, sy):
+        """Transforma la geometría compartida de K objetos en una sola llamada."""
+        return self.mult_Points_batch(
+            points, self.objectMatrices(tx, ty, deg, sx, sy)
+        )
+
     def loadId(self):
-        if self.matrixStack:
-            self.currentMatrix = self.matrixStack[-1].copy()  
+        if self.stackSize:
+            np.copyto(self.currentMatrix, self.matrixStack[self.stackSize - 1])
         else:
-            self.currentMatrix = np.identity(3)
-    
+            self.currentMatrix[...] = np.identity(3)
+
     def push(self):
-        self.matrixStack.append(self.currentMatrix.copy())
-    
+        if self.stackSize == len(self.matrixStack):
+            self.matrixStack = np.concatenate(
+                [self.matrixStack, np.empty_like(self.matrixStack)]
+            )
+        np.copyto(self.matrixStack[self.stackSize], self.currentMatrix)
+        self.stackSize += 1
+
     def pop(self):
-        if self.matrixStack:
-            self.matrixStack.pop(0)
-            if self.matrixStack:
-                self.currentMatrix = self.matrixStack[-1]
-            else:
-                self.currentMatrix = np.identity(3) 
+        if self.stackSize:
+            # Restaura la matriz guardada por el push correspondiente
+            self.stackSize -= 1
+            np.copyto(self.currentMatrix, self.matrixStack[self.stackSize])
         else:
             print("Stack está vacío.")
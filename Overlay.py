@@ -0,0 +1,55 @@
+import time
+
+import pygame
+
+# Cargamos las bibliotecas de OpenGL
+from OpenGL.GL import *
+
+class Overlay:
+    """Texto en la esquina superior izquierda de la ventana (p. ej. FrameStats).
+
+    El texto se rasteriza con pygame.font y se copia con glDrawPixels en
+    coordenadas de ventana, así que no depende del pan/zoom. Sólo se
+    vuelve a generar cada refresh segundos.
+    """
+
+    def __init__(self, size=14, color=(255, 255, 0), refresh=0.25, visible=False):
+        self.visible = visible
+        self.size = size
+        self.color = color
+        self.refresh = refresh
+        self.font = None
+        self.images = []
+        self.rendered = None
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def render(self, lines):
+        if self.font is None:
+            pygame.font.init()
+            self.font = pygame.font.SysFont("monospace", self.size)
+        self.images = []
+        for line in lines:
+            surface = self.font.render(line, True, self.color)
+            self.images.append((
+                surface.get_width(), surface.get_height(),
+                pygame.image.tostring(surface, "RGBA", True)
+            ))
+
+    def draw(self, lines):
+        """lines puede ser una función, que sólo se llama al refrescar."""
+        now = time.monotonic()
+        if self.rendered is None or now - self.rendered >= self.refresh:
+            self.render(lines() if callable(lines) else lines)
+            self.rendered = now
+
+        height = glGetIntegerv(GL_VIEWPORT)[3]
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        y = height
+        for width, lineHeight, pixels in self.images:
+            y -= lineHeight
+            glWindowPos2d(4, y)
+            glDrawPixels(width, lineHeight, GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+        glDisable(GL_BLEND)
@@ -0,0 +1,136 @@
+import numpy as np
+
+# Cargamos las bibliotecas de OpenGL
+from OpenGL.GL import *
+
+POINT_SIZE = 5.0
+
+def bresenham_points(p1, p2):
+    """Pixeles de Bresenham de todas las aristas p1[i] -> p2[i] a la vez.
+
+    p1 y p2 son arreglos (E,2). Regresa (puntos (M,2), arista de cada
+    punto (M,)) en el mismo orden y con los mismos valores que el
+    Bresenham original de Robot y Box: el primer punto redondeado y los
+    demás sin redondear.
+    Los pasos se recorren en orden, vectorizados sobre las aristas, para
+    que las sumas de punto flotante sean exactamente las mismas.
+    """
+    p1 = np.asarray(p1, dtype=np.float64).reshape(-1, 2)
+    p2 = np.asarray(p2, dtype=np.float64).reshape(-1, 2)
+    x0, y0 = p1[:, 0], p1[:, 1]
+    x1, y1 = p2[:, 0], p2[:, 1]
+
+    # Verificiar si la inclinación es > o < a 45°
+    steep = np.abs(y1 - y0) > np.abs(x1 - x0)
+    dx = np.where(steep, y1 - y0, x1 - x0)
+    dy = np.where(steep, x1 - x0, y1 - y0)
+    x = np.where(steep, y0, x0)
+    y = np.where(steep, x0, y0)
+
+    # Determinar dirección del incremento
+    signX = np.where(dx >= 0, 1.0, -1.0)
+    signY = np.where(dy >= 0, 1.0, -1.0)
+    dx = np.abs(dx)
+    dy = np.abs(dy)
+
+    # Variables de Bresenham
+    D = 2 * dy - dx
+    E = 2 * dy
+    NE = 2 * (dy - dx)
+
+    steps = dx.astype(np.int64)
+    width = 1 + (int(steps.max()) if len(steps) else 0)
+    xs = np.empty((len(steps), width))
+    ys = np.empty((len(steps), width))
+    xs[:, 0] = np.round(x)
+    ys[:, 0] = np.round(y)
+
+    for k in range(1, width):
+        up = D > 0
+        y = y + np.where(up, signY, 0.0)
+        D = D + np.where(up, NE, E)
+        x = x + signX
+        xs[:, k] = x
+        ys[:, k] = y
+
+    valid = np.arange(width)[None, :] <= steps[:, None]
+    points = np.where(
+        steep[:, None, None],
+        np.stack([ys, xs], axis=-1),
+        np.stack([xs, ys], axis=-1)
+    )
+    edges = np.broadcast_to(np.arange(len(steps))[:, None], valid.shape)
+    return points[valid], edges[valid]
+
+class Raster:
+    """Junta las aristas de un cuadro y las dibuja con un solo glDrawArrays."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        # Partes en orden de llegada: aristas por rasterizar o pixeles listos
+        self.parts = []
+
+    def addEdges(self, p1, p2, colors):
+        """Agrega las aristas (E,2) p1 -> p2 con un color (3,) o (E,3)."""
+        p1 = np.asarray(p1, dtype=np.float64).reshape(-1, 2)
+        self.parts.append((
+            p1,
+            np.asarray(p2, dtype=np.float64).reshape(-1, 2),
+            np.broadcast_to(np.asarray(colors, dtype=np.float32), (len(p1), 3))
+        ))
+
+    def addPixels(self, points, colors):
+        """Agrega pixeles (M,2) ya rasterizados con un color (3,) o (M,3)."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.parts.append((
+            points,
+            None,
+            np.broadcast_to(np.asarray(colors, dtype=np.float32), (len(points), 3))
+        ))
+
+    def rasterize(self):
+        """Regresa los vértices (M,2) y colores (M,3) float32 del cuadro."""
+        edgeParts = [part for part in self.parts if part[1] is not None]
+        pieces = iter(())
+        if edgeParts:
+            # Todas las aristas del cuadro en una sola llamada
+            points, edges = bresenham_points(
+                np.concatenate([part[0] for part in edgeParts]),
+                np.concatenate([part[1] for part in edgeParts])
+            )
+            edgeColors = np.concatenate([part[2] for part in edgeParts])[edges]
+            bounds = np.cumsum([len(part[0]) for part in edgeParts])[:-1]
+            splits = np.searchsorted(edges, bounds)
+            pieces = zip(np.split(points, splits), np.split(edgeColors, splits))
+
+        vertices = [np.zeros((0, 2))]
+        colors = [np.zeros((0, 3))]
+        for part in self.parts:
+            if part[1] is None:
+                vertices.append(part[0])
+                colors.append(part[2])
+            else:
+                points, partColors = next(pieces)
+                vertices.append(points)
+                colors.append(partColors)
+        return (
+            np.ascontiguousarray(np.concatenate(vertices), dtype=np.float32),
+            np.ascontiguousarray(np.concatenate(colors), dtype=np.float32)
+        )
+
+    def draw(self, present=True):
+        # present=False rasteriza sin tocar OpenGL (modo sin ventana)
+        vertices, colors = self.rasterize()
+        self.clear()
+        if not present or not len(vertices):
+            return
+        glPointSize(POINT_SIZE)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, vertices)
+        glColorPointer(3, GL_FLOAT, 0, colors)
+        glDrawArrays(GL_POINTS, 0, len(vertices))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
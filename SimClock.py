@@ -0,0 +1,84 @@
+import time
+from collections import deque
+
+import numpy as np
+
+from Snapshot import as_arrays
+
+# Máximo de snapshots en espera; si el servidor va más rápido se tiran los viejos
+MAX_PENDING = 3
+
+def orientation_to_degrees(orientation):
+    """Ángulo de dibujo de las orientaciones del servidor (0 Y+, 1 X-, 2 Y-, 3 X+)."""
+    return ((np.asarray(orientation, dtype=np.float64) + 1) % 4) * 90.0
+
+def robot_poses(robots):
+    """Posiciones (K,2) y ángulos (K,) de los robots de un snapshot."""
+    columns = as_arrays(robots)
+    pos = np.asarray(columns["pos"], dtype=np.float64).reshape(-1, 2)
+    theta = orientation_to_degrees(columns.get("orientation", np.zeros(len(pos))))
+    return pos, theta
+
+class SimClock:
+    """Reloj de paso fijo entre los snapshots del servidor y el render.
+
+    Los snapshots se consumen a razón de uno por tick (los segundos entre
+    actualizaciones) y el render, que va a la frecuencia de la pantalla,
+    interpola entre los dos últimos con alpha() en [0, 1]. Así la
+    velocidad de la animación no depende de los cuadros por segundo ni de
+    la latencia del servidor. Las poses de cada snapshot se pasan a
+    arreglos una vez, en push(), y no en cada cuadro.
+    """
+
+    def __init__(self, tick, clock=time.monotonic):
+        self.tick = tick
+        self.clock = clock
+        self.pending = deque(maxlen=MAX_PENDING)
+        self.previous = None
+        self.current = None
+        self.previousPoses = None
+        self.currentPoses = None
+        self.tickStart = None
+        self.ticks = 0
+
+    def push(self, snapshot):
+        """Encola un snapshot, con listas de agentes o columnas (Snapshot, Trace)."""
+        self.pending.append((snapshot, robot_poses(snapshot["robots"])))
+
+    def advance(self, now=None):
+        """Consume los snapshots que tocan; regresa True si cambió el actual."""
+        now = self.clock() if now is None else now
+        changed = False
+        if self.current is None:
+            if not self.pending:
+                return False
+            self.previous, self.previousPoses = self.pending.popleft()
+            self.current, self.currentPoses = self.previous, self.previousPoses
+            self.tickStart = now
+            changed = True
+        while self.pending and now - self.tickStart >= self.tick:
+            self.previous, self.previousPoses = self.current, self.currentPoses
+            self.current, self.currentPoses = self.pending.popleft()
+            # Si se quedó sin snapshots más de un tick, reinicia desde ahora
+            nextStart = self.tickStart + self.tick
+            self.tickStart = nextStart if now - nextStart < self.tick else now
+            self.ticks += 1
+            changed = True
+        return changed
+
+    def alpha(self, now=None):
+        if self.tickStart is None:
+            return 1.0
+        now = self.clock() if now is None else now
+        return min(1.0, max(0.0, (now - self.tickStart) / self.tick))
+
+    def robotPoses(self, now=None):
+        """Posiciones (K,2) en la rejilla y ángulos (K,) en grados interpolados."""
+        pos0, theta0 = self.previousPoses
+        pos1, theta1 = self.currentPoses
+        if len(pos0) != len(pos1):
+            pos0, theta0 = pos1, theta1
+        alpha = self.alpha(now)
+        # Gira por el camino corto
+        turn = (theta1 - theta0 + 180.0) % 360.0 - 180.0
+        return pos0 + alpha * (pos1 - pos0), theta0 + alpha * turn
@@ -0,0 +1,115 @@
+import numpy as np
+
+from EntityStore import STATUS_CODES, STATUS_UNKNOWN
+
+# Formato binario de webapi.jl (?format=binary o Accept: CONTENT_TYPE)
+MAGIC = b"AMZS"
+VERSION = 1
+CONTENT_TYPE = "application/octet-stream"
+# Cada arreglo empieza en un múltiplo de ALIGN bytes
+ALIGN = 8
+HEADER = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u2"),
+    ("flags", "<u2"),
+    ("robots", "<u4"),
+    ("boxes", "<u4"),
+    ("storages", "<u4"),
+    ("location", "<u4"),
+])
+KINDS = ("robots", "boxes", "storages")
+# Columnas (nombre, tipo, forma por agente) de cada tipo, en el orden del mensaje
+LAYOUT = {
+    "robots": (
+        ("ids", "<i8", ()),
+        ("pos", "<i4", (2,)),
+        ("orientation", "i1", ()),
+        ("dx", "i1", ()),
+        ("dy", "i1", ()),
+        ("counter", "<i4", ()),
+    ),
+    "boxes": (
+        ("ids", "<i8", ()),
+        ("pos", "<i4", (2,)),
+        ("status", "i1", ()),
+    ),
+    "storages": (
+        ("ids", "<i8", ()),
+        ("pos", "<i4", (2,)),
+    ),
+}
+
+def aligned(offset):
+    return offset + (-offset % ALIGN)
+
+def decode(buffer):
+    """Mensaje binario -> {"robots": {columna: arreglo}, ..., "Location": ruta}.
+
+    Las columnas son vistas de sólo lectura sobre buffer hechas con
+    np.frombuffer, sin copiar; status viene en los códigos de EntityStore.
+    """
+    if len(buffer) < HEADER.itemsize:
+        raise ValueError("Binary snapshot too short: {} bytes".format(len(buffer)))
+    header = np.frombuffer(buffer, dtype=HEADER, count=1)[0]
+    if header["magic"] != MAGIC:
+        raise ValueError("Not a binary snapshot")
+    if header["version"] != VERSION:
+        raise ValueError("Unknown snapshot version: {}".format(header["version"]))
+
+    offset = HEADER.itemsize
+    length = int(header["location"])
+    snapshot = {}
+    if length:
+        snapshot["Location"] = bytes(buffer[offset:offset + length]).decode()
+    offset = aligned(offset + length)
+
+    for kind in KINDS:
+        count = int(header[kind])
+        columns = {}
+        for name, dtype, shape in LAYOUT[kind]:
+            dtype = np.dtype(dtype)
+            size = count * int(np.prod(shape))
+            if offset + size * dtype.itemsize > len(buffer):
+                raise ValueError("Binary snapshot truncated in {} {}".format(kind, name))
+            columns[name] = np.frombuffer(
+                buffer, dtype=dtype, count=size, offset=offset
+            ).reshape((count,) + shape)
+            offset = aligned(offset + size * dtype.itemsize)
+        snapshot[kind] = columns
+    return snapshot
+
+def encode(snapshot, location=""):
+    """Inverso de decode, con el mismo formato que escribe webapi.jl."""
+    location = location.encode()
+    header = np.zeros(1, dtype=HEADER)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["location"] = len(location)
+    parts = [header.tobytes(), location, b"\0" * (-(HEADER.itemsize + len(location)) % ALIGN)]
+    for kind in KINDS:
+        columns = as_arrays(snapshot[kind])
+        header[kind] = len(columns["ids"])
+        for name, dtype, shape in LAYOUT[kind]:
+            data = np.ascontiguousarray(columns.get(name, 0), dtype=dtype)
+            data = np.broadcast_to(data, (len(columns["ids"]),) + shape).tobytes()
+            parts += [data, b"\0" * (-len(data) % ALIGN)]
+    parts[0] = header.tobytes()
+    return b"".join(parts)
+
+def as_arrays(agents):
+    """Columnas NumPy de una lista de agentes JSON; las ya decodificadas pasan igual."""
+    if isinstance(agents, dict):
+        return agents
+    columns = {
+        "ids": np.array([agent.get("id", i) for i, agent in enumerate(agents)], dtype=np.int64),
+        "pos": np.array([agent["pos"][:2] for agent in agents], dtype=np.float64).reshape(-1, 2),
+    }
+    first = agents[0] if agents else {}
+    for name in ("orientation", "dx", "dy", "counter"):
+        if name in first:
+            columns[name] = np.array([agent[name] for agent in agents])
+    if "status" in first:
+        columns["status"] = np.array(
+            [STATUS_CODES.get(agent["status"], STATUS_UNKNOWN) for agent in agents], dtype=np.int8
+        )
+    return columns
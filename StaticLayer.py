@@ -0,0 +1,35 @@
+# Cargamos las bibliotecas de OpenGL
+from OpenGL.GL import *
+
+class StaticLayer:
+    """Capa estática guardada en un display list.
+
+    draw(signature, build) sólo vuelve a grabar la lista cuando la firma
+    cambia (p. ej. estado o posición de las cajas); si no, la reproduce
+    con un solo glCallList. build debe dibujar con arreglos de cliente o
+    modo inmediato, que se copian dentro de la lista al grabarla.
+    """
+
+    def __init__(self):
+        self.displayList = None
+        self.signature = None
+        self.rebuilds = 0
+        self.frames = 0
+
+    def invalidate(self):
+        self.signature = None
+
+    def draw(self, signature, build):
+        if self.displayList is None:
+            self.displayList = glGenLists(1)
+        if self.signature is None or signature != self.signature:
+            glNewList(self.displayList, GL_COMPILE)
+            build()
+            glEndList()
+            self.signature = signature
+            self.rebuilds += 1
+        glCallList(self.displayList)
+        self.frames += 1
+
+    def info(self):
+        return {'rebuilds': self.rebuilds, 'frames': self.frames}
@@ -0,0 +1,203 @@
+import json
+import os
+
+import numpy as np
+
+from EntityStore import STATUS_CODES, STATUS_UNKNOWN
+from Snapshot import as_arrays
+
+MAGIC = b"AMZTRACE"
+VERSION = 1
+# Los pasos empiezan en un múltiplo de ALIGN bytes
+ALIGN = 64
+KINDS = ("robots", "boxes", "storages")
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+def step_dtype(counts):
+    """Registro de ancho fijo de un paso para counts agentes por tipo."""
+    robots, boxes, storages = (counts[kind] for kind in KINDS)
+    return np.dtype([
+        ("robot_pos", "<f4", (robots, 2)),
+        ("robot_orientation", "i1", (robots,)),
+        ("robot_dx", "i1", (robots,)),
+        ("robot_dy", "i1", (robots,)),
+        ("robot_counter", "<i4", (robots,)),
+        ("box_pos", "<f4", (boxes, 2)),
+        ("box_status", "i1", (boxes,)),
+        ("storage_pos", "<f4", (storages, 2)),
+    ])
+
+class TraceWriter:
+    """Graba cada snapshot del servidor (JSON o binario) como un registro de ancho fijo.
+
+    El archivo es MAGIC, la longitud (uint32) de un encabezado JSON con
+    los ids de cada tipo de agente y, desde un múltiplo de ALIGN bytes,
+    un registro step_dtype por paso. Los agentes se guardan en el orden
+    de ids del primer snapshot; el servidor no crea ni destruye agentes,
+    así que un snapshot con otros ids es un error.
+    """
+
+    def __init__(self, path, flushEvery=64):
+        self.path = path
+        self.flushEvery = flushEvery
+        self.file = None
+        self.dtype = None
+        self.columns = None
+        self.steps = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def start(self, snapshot):
+        ids = {kind: as_arrays(snapshot[kind])["ids"].tolist() for kind in KINDS}
+        header = json.dumps({
+            'version': VERSION,
+            'counts': {kind: len(ids[kind]) for kind in KINDS},
+            'ids': ids,
+        }).encode()
+        start = len(MAGIC) + 4
+        header += b" " * (-(start + len(header)) % ALIGN)
+        self.dtype = step_dtype({kind: len(ids[kind]) for kind in KINDS})
+        self.columns = {kind: {agentId: i for i, agentId in enumerate(ids[kind])} for kind in KINDS}
+        self.file = open(self.path, "wb")
+        self.file.write(MAGIC)
+        self.file.write(np.uint32(len(header)).astype("<u4").tobytes())
+        self.file.write(header)
+
+    def encode(self, snapshot):
+        record = np.zeros(1, dtype=self.dtype)[0]
+        columns = {}
+        cols = {}
+        for kind in KINDS:
+            columns[kind] = as_arrays(snapshot[kind])
+            ids = columns[kind]["ids"].tolist()
+            try:
+                cols[kind] = [self.columns[kind][agentId] for agentId in ids]
+            except KeyError as e:
+                raise ValueError("Unknown {} id in trace snapshot: {}".format(kind, e.args[0]))
+            if len(set(cols[kind])) != len(self.columns[kind]):
+                raise ValueError("Trace expects {} {}, got {}".format(
+                    len(self.columns[kind]), kind, len(ids)))
+
+        robots, robotCols = columns["robots"], cols["robots"]
+        record["robot_pos"][robotCols] = robots["pos"]
+        for name in ("orientation", "dx", "dy", "counter"):
+            if name in robots:
+                record["robot_" + name][robotCols] = robots[name]
+        boxes = columns["boxes"]
+        record["box_pos"][cols["boxes"]] = boxes["pos"]
+        record["box_status"][cols["boxes"]] = boxes.get("status", STATUS_UNKNOWN)
+        record["storage_pos"][cols["storages"]] = columns["storages"]["pos"]
+        return record
+
+    def write(self, snapshot):
+        if self.file is None:
+            self.start(snapshot)
+        self.file.write(self.encode(snapshot).tobytes())
+        self.steps += 1
+        if self.steps % self.flushEvery == 0:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class TraceReader:
+    """Lee un trace de TraceWriter con np.memmap, sin cargarlo a memoria.
+
+    reader[i] es el registro del paso i (una vista del archivo),
+    columns(i) lo regresa como columnas y snapshot(i) en el formato JSON
+    del servidor. Un último registro incompleto (p. ej. si la grabación
+    se interrumpió) se ignora.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("Not a trace file: {}".format(path))
+            size = f.read(4)
+            length = int(np.frombuffer(size, dtype="<u4")[0]) if len(size) == 4 else 0
+            header = f.read(length)
+            if not length or len(header) < length:
+                raise ValueError("Trace header truncated: {}".format(path))
+            header = json.loads(header)
+        if header['version'] != VERSION:
+            raise ValueError("Unknown trace version: {}".format(header['version']))
+        self.counts = header['counts']
+        self.ids = {kind: np.array(header['ids'][kind], dtype=np.int64) for kind in KINDS}
+        self.dtype = step_dtype(self.counts)
+        if self.dtype.itemsize == 0:
+            raise ValueError("Trace has no agents: {}".format(path))
+        offset = len(MAGIC) + 4 + length
+        steps = (os.path.getsize(path) - offset) // self.dtype.itemsize
+        if steps:
+            self.records = np.memmap(path, dtype=self.dtype, mode="r", offset=offset, shape=(steps,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, step):
+        return self.records[step]
+
+    def columns(self, step):
+        """El paso como columnas (vistas del registro), como Snapshot.decode.
+
+        Es lo que aceptan EntityStore.load, SimClock.push y TraceWriter
+        sin armar un dict por agente; status viene en códigos.
+        """
+        record = self.records[step]
+        return {
+            "robots": {
+                "ids": self.ids["robots"],
+                "pos": record["robot_pos"],
+                "orientation": record["robot_orientation"],
+                "dx": record["robot_dx"],
+                "dy": record["robot_dy"],
+                "counter": record["robot_counter"],
+            },
+            "boxes": {
+                "ids": self.ids["boxes"],
+                "pos": record["box_pos"],
+                "status": record["box_status"],
+            },
+            "storages": {"ids": self.ids["storages"], "pos": record["storage_pos"]},
+        }
+
+    def snapshot(self, step):
+        record = self.records[step]
+        ids = {kind: self.ids[kind].tolist() for kind in KINDS}
+        robots = [
+            {
+                'id': agentId,
+                'pos': pos.tolist(),
+                'orientation': int(orientation),
+                'dx': int(dx),
+                'dy': int(dy),
+                'counter': int(counter),
+            }
+            for agentId, pos, orientation, dx, dy, counter in zip(
+                ids["robots"], record["robot_pos"], record["robot_orientation"],
+                record["robot_dx"], record["robot_dy"], record["robot_counter"]
+            )
+        ]
+        boxes = [
+            {'id': agentId, 'pos': pos.tolist(), 'status': STATUS_NAMES.get(int(status), "unknown")}
+            for agentId, pos, status in zip(ids["boxes"], record["box_pos"], record["box_status"])
+        ]
+        storages = [
+            {'id': agentId, 'pos': pos.tolist()}
+            for agentId, pos in zip(ids["storages"], record["storage_pos"])
+        ]
+        return {"robots": robots, "boxes": boxes, "storages": storages}
+
+    def close(self):
+        # Suelta el mapeo del archivo
+        self.records = np.zeros(0, dtype=self.dtype)
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from Raster import bresenham_points
+
+class TransformCache:
+    """Caché acotado de vértices transformados y pixeles por pose.
+
+    La llave es la pose: (figura, matriz de mundo, x, y, theta, escala),
+    así que un agente quieto vuelve a encontrar sus pixeles sin
+    recalcularlos. Con más de maxsize poses se descarta la menos usada.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def transform(self, opera, shape, pos, theta, scale):
+        """Regresa, por instancia, (puntos (N,2), pixeles (M,2)) de la figura.
+
+        Las instancias que fallan en el caché se transforman y rasterizan
+        juntas en una sola llamada.
+        """
+        world = opera.currentMatrix.tobytes()
+        pos = np.asarray(pos, dtype=np.float64).reshape(-1, 2)
+        theta = np.broadcast_to(np.asarray(theta, dtype=np.float64), len(pos))
+        scale = np.broadcast_to(np.asarray(scale, dtype=np.float64), len(pos))
+        results = []
+        missing = []
+        keys = []
+
+        for k in range(len(pos)):
+            key = (shape.name, world, pos[k, 0], pos[k, 1], theta[k], scale[k])
+            value = self.lookup(key)
+            results.append(value)
+            keys.append(key)
+            if value is None:
+                missing.append(k)
+
+        if missing:
+            pointsR = opera.transformObjects(
+                shape.points, pos[missing, 0], pos[missing, 1],
+                theta[missing], scale[missing], scale[missing]
+            )
+            pixels, edges = bresenham_points(
+                pointsR[:, shape.edges[:, 0]], pointsR[:, shape.edges[:, 1]]
+            )
+            bounds = np.arange(1, len(missing)) * len(shape.edges)
+            splits = np.searchsorted(edges, bounds)
+            for k, points, objectPixels in zip(missing, pointsR, np.split(pixels, splits)):
+                value = (points, objectPixels)
+                results[k] = value
+                self.put(keys[k], value)
+
+        return results
+
+    def clear(self):
+        self.entries.clear()
+
+    def info(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+        }
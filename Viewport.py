@@ -0,0 +1,100 @@
+import numpy as np
+
+# Cargamos las bibliotecas de OpenGL
+from OpenGL.GL import *
+from OpenGL.GLU import *
+
+class Viewport:
+    """Ventana visible del mundo con desplazamiento y zoom.
+
+    Parte de los límites de gluOrtho2D dados. zoom > 1 acerca y zoom < 1
+    aleja; cuando el ancho visible supera lodWidth conviene dibujar cada
+    agente como un solo punto (isLod).
+    """
+
+    def __init__(self, xmin, xmax, ymin, ymax, lodWidth=4000.0, minZoom=0.01, maxZoom=20.0):
+        self.centerX = (xmin + xmax) / 2
+        self.centerY = (ymin + ymax) / 2
+        self.baseWidth = xmax - xmin
+        self.baseHeight = ymax - ymin
+        self.zoom = 1.0
+        self.lodWidth = lodWidth
+        self.minZoom = minZoom
+        self.maxZoom = maxZoom
+
+    def bounds(self, margin=0.0):
+        """(xmin, xmax, ymin, ymax) visibles, agrandados por margin."""
+        halfWidth = self.baseWidth / self.zoom / 2 + margin
+        halfHeight = self.baseHeight / self.zoom / 2 + margin
+        return (
+            self.centerX - halfWidth, self.centerX + halfWidth,
+            self.centerY - halfHeight, self.centerY + halfHeight
+        )
+
+    def pan(self, fx, fy):
+        """Desplaza una fracción fx, fy del ancho y alto visibles."""
+        self.centerX += fx * self.baseWidth / self.zoom
+        self.centerY += fy * self.baseHeight / self.zoom
+
+    def zoomBy(self, factor):
+        self.zoom = min(max(self.zoom * factor, self.minZoom), self.maxZoom)
+
+    def isLod(self):
+        return self.baseWidth / self.zoom > self.lodWidth
+
+    def apply(self):
+        xmin, xmax, ymin, ymax = self.bounds()
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluOrtho2D(xmin, xmax, ymin, ymax)
+        glMatrixMode(GL_MODELVIEW)
+
+class SpatialHash:
+    """Índices de agentes por celda de una rejilla, para buscar por rectángulo."""
+
+    def __init__(self, cellSize=100.0):
+        self.cellSize = cellSize
+        self.positions = np.zeros((0, 2))
+        self.cells = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def rebuild(self, positions):
+        """Vuelve a llenar la rejilla con las posiciones (K,2) de los agentes."""
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.cells = {}
+        if not len(self.positions):
+            return
+        cells = np.floor(self.positions / self.cellSize).astype(np.int64)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        keys, starts = np.unique(cells[order], axis=0, return_index=True)
+        ends = list(starts[1:]) + [len(order)]
+        for key, start, end in zip(keys, starts, ends):
+            self.cells[(int(key[0]), int(key[1]))] = order[start:end]
+
+    def query(self, xmin, xmax, ymin, ymax):
+        """Índices ordenados de los agentes dentro del rectángulo."""
+        positions = self.positions
+        cx0, cx1 = int(np.floor(xmin / self.cellSize)), int(np.floor(xmax / self.cellSize))
+        cy0, cy1 = int(np.floor(ymin / self.cellSize)), int(np.floor(ymax / self.cellSize))
+
+        # Si la ventana cubre más celdas de las que hay ocupadas, basta una máscara
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) >= len(self.cells):
+            candidates = np.arange(len(positions))
+        else:
+            found = [
+                self.cells[(cx, cy)]
+                for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)
+                if (cx, cy) in self.cells
+            ]
+            if not found:
+                return np.zeros(0, dtype=np.int64)
+            candidates = np.sort(np.concatenate(found))
+
+        points = positions[candidates]
+        inside = (
+            (points[:, 0] >= xmin) & (points[:, 0] <= xmax) &
+            (points[:, 1] >= ymin) & (points[:, 1] <= ymax)
+        )
+        return candidates[inside]
@@ -0,0 +1,325 @@
+"""Throughput and scaling benchmarks for py3dbp.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.bench_py3dbp --output bench.json
+    python -m benchmarks.bench_py3dbp --fixed-point --compare bench.json
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from py3dbp import Packer, Bin, Item, PivotStrategy
+
+DEFAULT_COUNTS = [10, 30, 100, 300, 1000, 3000, 10000]
+PERCENTILES = [50, 90, 99]
+
+# Bins and items from storage.jl.
+CATALOGUE_BINS = [
+    ("small-envelope", 11.5, 6.125, 0.25, 10),
+    ("large-envelope", 15.0, 12.0, 0.75, 15),
+    ("small-box", 8.625, 5.375, 1.625, 70.0),
+    ("medium-box", 11.0, 8.5, 5.5, 70.0),
+    ("medium-2-box", 13.625, 11.875, 3.375, 70.0),
+    ("large-box", 12.0, 12.0, 5.5, 70.0),
+    ("large-2-box", 23.6875, 11.75, 3.0, 70.0),
+]
+CATALOGUE_ITEMS = [
+    ("50g [powder]", 3.9370, 1.9685, 1.9685, 0.05),
+    ("250g [powder]", 7.8740, 3.9370, 1.9685, 0.25),
+]
+
+
+def get_bin_for(items, slack=1.3):
+    # One cubic bin with some headroom over the total item volume, so the
+    # amount of work grows with the item count instead of saturating.
+    volume = sum(w * h * d for _, w, h, d, _ in items)
+    side = round(max(
+        (volume * slack) ** (1 / 3),
+        max(max(w, h, d) for _, w, h, d, _ in items)
+    ), 3)
+    weight = sum(weight for *_, weight in items) + 1
+
+    return [("bench-bin", side, side, side, weight)]
+
+
+def generate_uniform(rng, count):
+    items = [
+        (
+            "uniform-%d" % index, round(rng.uniform(1, 10), 3),
+            round(rng.uniform(1, 10), 3), round(rng.uniform(1, 10), 3),
+            round(rng.uniform(0.1, 5), 3)
+        )
+        for index in range(count)
+    ]
+
+    return get_bin_for(items), items
+
+
+def generate_heavy_tailed(rng, count):
+    def size():
+        return round(min(1 + rng.paretovariate(1.5), 40), 3)
+
+    items = [
+        (
+            "heavy-%d" % index, size(), size(), size(),
+            round(rng.uniform(0.1, 5), 3)
+        )
+        for index in range(count)
+    ]
+
+    return get_bin_for(items), items
+
+
+def generate_identical_skus(rng, count):
+    skus = [
+        (
+            round(rng.uniform(2, 8), 3), round(rng.uniform(2, 8), 3),
+            round(rng.uniform(2, 8), 3), round(rng.uniform(0.1, 2), 3)
+        )
+        for _ in range(3)
+    ]
+    items = [
+        ("sku-%d" % index,) + rng.choice(skus) for index in range(count)
+    ]
+
+    return get_bin_for(items), items
+
+
+def generate_catalogue(rng, count):
+    items = []
+
+    for index in range(count):
+        name, width, height, depth, weight = rng.choice(CATALOGUE_ITEMS)
+        items.append(
+            ("%s %d" % (name, index), width, height, depth, weight)
+        )
+
+    return list(CATALOGUE_BINS), items
+
+
+GENERATORS = {
+    "uniform": generate_uniform,
+    "heavy_tailed": generate_heavy_tailed,
+    "identical_skus": generate_identical_skus,
+    "catalogue": generate_catalogue,
+}
+
+
+class TimedBin(Bin):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.put_item_latencies = []
+
+    def put_item(self, item, pivot):
+        start = time.perf_counter()
+        fitted = super().put_item(item, pivot)
+        self.put_item_latencies.append(time.perf_counter() - start)
+
+        return fitted
+
+    def put_item_vectorized(self, item, pivots=None):
+        start = time.perf_counter()
+        fitted = super().put_item_vectorized(item, pivots)
+        self.put_item_latencies.append(time.perf_counter() - start)
+
+        return fitted
+
+
+class TimedPacker(Packer):
+    def __init__(self):
+        super().__init__()
+        self.pack_to_bin_latencies = []
+
+    def pack_to_bin(self, bin, item):
+        start = time.perf_counter()
+        super().pack_to_bin(bin, item)
+        self.pack_to_bin_latencies.append(time.perf_counter() - start)
+
+
+def get_percentiles(latencies):
+    if not latencies:
+        return None
+
+    latencies = sorted(latencies)
+    summary = {
+        "p%d" % percentile: latencies[
+            max(0, math.ceil(percentile / 100 * len(latencies)) - 1)
+        ]
+        for percentile in PERCENTILES
+    }
+    summary["max"] = latencies[-1]
+    summary["mean"] = sum(latencies) / len(latencies)
+    summary["count"] = len(latencies)
+
+    return summary
+
+
+def run_once(bin_specs, item_specs, pack_options):
+    packer = TimedPacker()
+    bins = [TimedBin(*spec) for spec in bin_specs]
+
+    for bin in bins:
+        packer.add_bin(bin)
+
+    for spec in item_specs:
+        packer.add_item(Item(*spec))
+
+    start = time.perf_counter()
+    packer.pack(**pack_options)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seconds": elapsed,
+        "fitted": sum(len(bin.items) for bin in bins),
+        "pack_to_bin": packer.pack_to_bin_latencies,
+        "put_item": [
+            latency for bin in bins for latency in bin.put_item_latencies
+        ],
+    }
+
+
+def run_scenario(generator, count, repeats, seed, pack_options):
+    pack_latencies = []
+    pack_to_bin_latencies = []
+    put_item_latencies = []
+    fitted = []
+
+    for repeat in range(repeats):
+        rng = random.Random("%s-%d-%d-%d" % (generator, count, seed, repeat))
+        bin_specs, item_specs = GENERATORS[generator](rng, count)
+        result = run_once(bin_specs, item_specs, pack_options)
+        pack_latencies.append(result["seconds"])
+        pack_to_bin_latencies.extend(result["pack_to_bin"])
+        put_item_latencies.extend(result["put_item"])
+        fitted.append(result["fitted"])
+
+    total_seconds = sum(pack_latencies)
+
+    return {
+        "generator": generator,
+        "items": count,
+        "repeats": repeats,
+        "items_per_second": count * repeats / total_seconds
+        if total_seconds else None,
+        "fitted_items": fitted,
+        "pack": get_percentiles(pack_latencies),
+        "pack_to_bin": get_percentiles(pack_to_bin_latencies),
+        "put_item": get_percentiles(put_item_latencies),
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(generators, counts, repeats, seed, time_limit, pack_options):
+    results = []
+
+    for generator in generators:
+        for count in counts:
+            result = run_scenario(generator, count, repeats, seed, pack_options)
+            results.append(result)
+            print(
+                "%-15s %6d items  %10.1f items/s  pack p50 %.4fs" % (
+                    generator, count, result["items_per_second"] or 0,
+                    result["pack"]["p50"]
+                ),
+                file=sys.stderr
+            )
+
+            # Larger counts only get slower; stop this curve here.
+            if time_limit and result["pack"]["max"] > time_limit:
+                break
+
+    return {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": seed,
+        "pack_options": pack_options,
+        "results": results,
+    }
+
+
+def compare(report, baseline):
+    baseline_results = {
+        (result["generator"], result["items"]): result
+        for result in baseline["results"]
+    }
+
+    for result in report["results"]:
+        old = baseline_results.get((result["generator"], result["items"]))
+        if not old or not old["items_per_second"]:
+            continue
+
+        print("%-15s %6d items  %6.2fx throughput vs %s" % (
+            result["generator"], result["items"],
+            result["items_per_second"] / old["items_per_second"],
+            (baseline.get("commit") or "baseline")[:10]
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--generators", nargs="+", choices=sorted(GENERATORS),
+        default=sorted(GENERATORS)
+    )
+    parser.add_argument("--counts", nargs="+", type=int, default=DEFAULT_COUNTS)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--time-limit", type=float, default=60.0,
+        help="skip larger counts once one pack takes longer (seconds)"
+    )
+    parser.add_argument("--bigger-first", action="store_true")
+    parser.add_argument("--distribute-items", action="store_true")
+    parser.add_argument("--fixed-point", action="store_true")
+    parser.add_argument("--vectorized", action="store_true")
+    parser.add_argument(
+        "--pivot-strategy", choices=PivotStrategy.ALL,
+        default=PivotStrategy.ITEM_CORNERS
+    )
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    pack_options = {
+        "bigger_first": args.bigger_first,
+        "distribute_items": args.distribute_items,
+        "fixed_point": args.fixed_point,
+        "vectorized": args.vectorized,
+        "pivot_strategy": args.pivot_strategy,
+    }
+    report = run_suite(
+        args.generators, args.counts, args.repeats, args.seed,
+        args.time_limit, pack_options
+    )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            compare(report, json.load(baseline))
+
+
+if __name__ == "__main__":
+    main()
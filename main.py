@@ -1,9 +1,11 @@
+import argparse
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GLUT import *
 import requests
+import numpy as np
 
 # Constants
 SCREEN_WIDTH = 900
@@ -12,75 +14,120 @@ X_MIN, X_MAX, Y_MIN, Y_MAX, DIM_BOARD = 0, 750, 0, 750, 750
 ROBOT_SCALE = 20
 BOX_SCALE = 10
 URL_BASE = "http://localhost:8000"
+PAN_STEP = 0.02      # Fracción de la ventana que se desplaza por cuadro
+ZOOM_STEP = 1.05     # Factor de zoom por cuadro
+LOD_WIDTH = 4000     # Ancho visible a partir del cual cada agente es un punto
+CULL_MARGIN = 50     # Margen para no recortar agentes en el borde
+HASH_CELL = 200      # Tamaño de celda del hash espacial
+STATS_ENABLED = True # Cronometrar las fases de cada cuadro
+VERBOSITY = 1        # 0 nada, 1 errores y resúmenes, 2 depuración por cuadro
+STATS_FILE = None    # p. ej. "frame_stats.csv" o ".json" para exportar cada STATS_EVERY s
+STATS_EVERY = 5.0
+SHOW_OVERLAY = False # F3 muestra/oculta las estadísticas en pantalla
+UPDATE_INTERVAL = 0.5  # Update data every 500 milliseconds
+MAX_FPS = 120          # Upper bound; vsync paces frames to the display
+SCRUB_STEP = 100     # Pasos que saltan , y . al reproducir un trace
+BINARY = True        # Pedir snapshots en binario (el servidor puede contestar JSON)
 
 # Custom Imports
 from OpMat import OpMat
 from Robot import Robot
 from Box import Box
+from Raster import Raster
+from Geometry import InstancedRenderer
+from TransformCache import TransformCache
+from StaticLayer import StaticLayer
+from Viewport import Viewport, SpatialHash
+from Fetcher import Fetcher, decode_response
+import Snapshot
+from SimClock import SimClock
+from EntityStore import EntityStore, STATUS_TAKEN, TURN_NAMES
+from FrameStats import FrameStats, SUMMARY, DEBUG
+from Overlay import Overlay
+from Trace import TraceReader, TraceWriter
 
-# Initialize Pygame and OpenGL
-pygame.init()
+# Estado del cliente; pygame y OpenGL se inician en main()
+stats = FrameStats(STATS_ENABLED, VERBOSITY, path=STATS_FILE, exportEvery=STATS_EVERY)
+overlay = Overlay(visible=SHOW_OVERLAY)
 opera = OpMat()
+raster = Raster()
+transform_cache = TransformCache()
+renderer = InstancedRenderer(opera, raster, transform_cache, stats)
+# Capa estática: se dibuja por CPU (arreglos de cliente) para poder grabarla
+static_raster = Raster()
+static_renderer = InstancedRenderer(opera, static_raster, transform_cache, stats)
+static_renderer.instanced = False
+static_layer = StaticLayer()
+viewport = Viewport(-100, 1000, -100, 1000, LOD_WIDTH)
+# Posiciones de los agentes por tipo, refrescadas con cada actualización
+agent_hashes = {
+    "robots": SpatialHash(HASH_CELL),
+    "boxes": SpatialHash(HASH_CELL),
+    "storages": SpatialHash(HASH_CELL),
+}
 
-# Initialize data and objects
-robots = {}
-robotsDx = {}
-robotsDy = {}
-robotOrientation = {}
-robotsCounter = {}
-packages = {}
-storages = {}
+# Estado de los agentes: una fila por agente en arreglos NumPy
+robot_store = EntityStore(color=(1.0, 1.0, 1.0), scale=0.5, rotationStep=10)
+box_store = EntityStore(color=(1.0, 1.0, 0.0), scale=3, rotationStep=5)
+storage_store = EntityStore(color=(0.0, 1.0, 1.0), scale=3, rotationStep=5)
+# Filas de los agentes del último snapshot, en el orden del servidor
+current_rows = {
+    "robots": np.zeros(0, dtype=np.int64),
+    "boxes": np.zeros(0, dtype=np.int64),
+    "storages": np.zeros(0, dtype=np.int64),
+}
 
 # Helper Functions
-def fetch_data():
+def fetch_data(url_base=URL_BASE, binary=BINARY):
     """Fetch data from server and handle errors."""
+    headers = {"Accept": Snapshot.CONTENT_TYPE} if binary else {}
     try:
-        response = requests.post(URL_BASE + "/simulations", allow_redirects=False)
+        response = requests.post(url_base + "/simulations", headers=headers, allow_redirects=False)
         response.raise_for_status()
-        datos = response.json()
+        datos = decode_response(response)
         robots_data = datos["robots"]
         boxes_data = datos["boxes"]
         storages_data = datos["storages"]
         location = datos["Location"]
         return robots_data, boxes_data, storages_data, location
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data: {e}")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        stats.log(SUMMARY, f"Error fetching data: {e}")
         return None, None, None, None
 
-def update_data(location):
-    """Update data from server using the specified location."""
-    try:
-        response = requests.get(URL_BASE + location)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error updating data: {e}")
-        return None
-
-def initialize_objects(robots_data, boxes_data, storages_data):
-    """Initialize robot, box, and storage objects based on the server data."""
-    for i, rob in enumerate(robots_data):
-        robots[f"r{i}"] = Robot(opera)
-        robotsDx[f"r{i}"] = (rob["dx"])
-        robotsDy[f"r{i}"] = (rob["dy"])
-        robotOrientation[f"r{i}"] = (rob["orientation"])
-        robotsCounter[f"r{i}"] = (rob["counter"])
-    for i, _ in enumerate(boxes_data):
-        packages[f"b{i}"] = Box(opera)
-    for i, _ in enumerate(storages_data):
-        storages[f"s{i}"] = Box(opera)
-
-def update_robot_positions(robots_data):
-    """Refresh robotsNewPos and robotOrientation based on latest robots_data."""
-    for i, rob in enumerate(robots_data):
-        robotOrientation[f"r{i}"] = rob["orientation"]
-        robotsDx[f"r{i}"] = (rob["dx"])
-        robotsDy[f"r{i}"] = (rob["dy"])
-        robotsCounter[f"r{i}"] = (rob["counter"])
-
-def get_scaled_coords(data, scale_factor=10):
-    """Get scaled coordinates from data for a given scale factor."""
-    return [(item["pos"][0] * scale_factor, item["pos"][1] * scale_factor) for item in data]
+def load_agents(robots_data, boxes_data, storages_data):
+    """Write the latest server lists into the entity stores."""
+    current_rows["robots"] = robot_store.load(robots_data)
+    current_rows["boxes"] = box_store.load(boxes_data)
+    current_rows["storages"] = storage_store.load(storages_data)
+
+def drawn_offsets(shape, pos, scale):
+    """Where instances at grid positions pos end up on screen.
+
+    OpMat weights the translation by the shape's third coordinate, so a
+    robot (z=0.5) at pos*ROBOT_SCALE is drawn at pos*ROBOT_SCALE*0.5.
+    Hashing, culling and LOD points all use this position.
+    """
+    return np.asarray(pos, dtype=np.float64) * (scale * shape.weight)
+
+def refresh_spatial_hashes():
+    """Rebuild the spatial hashes from the latest server positions."""
+    agent_hashes["robots"].rebuild(drawn_offsets(Robot.SHAPE, robot_store.pos[current_rows["robots"]], ROBOT_SCALE))
+    agent_hashes["boxes"].rebuild(drawn_offsets(Box.SHAPE, box_store.pos[current_rows["boxes"]], BOX_SCALE))
+    agent_hashes["storages"].rebuild(drawn_offsets(Box.SHAPE, storage_store.pos[current_rows["storages"]], BOX_SCALE))
+
+def visible_mask(kind, margin=CULL_MARGIN):
+    """Which agents of a kind, in current_rows order, are inside the viewport."""
+    mask = np.zeros(len(current_rows[kind]), dtype=bool)
+    mask[agent_hashes[kind].query(*viewport.bounds(margin))] = True
+    return mask
+
+def in_view(offsets, margin=CULL_MARGIN):
+    """Which drawn offsets (K,2) are inside the viewport, without the hash."""
+    xmin, xmax, ymin, ymax = viewport.bounds(margin)
+    return (
+        (offsets[:, 0] >= xmin) & (offsets[:, 0] <= xmax) &
+        (offsets[:, 1] >= ymin) & (offsets[:, 1] <= ymax)
+    )
 
 def Axis():
     """Render the X and Y axes."""
@@ -98,10 +145,41 @@ def Axis():
     glEnd()
     glLineWidth(1.0)
 
-def display(robots_data, boxes_data, storages_data):
-    print(robotOrientation)
-    """Render the entire scene with robots, boxes, and storages."""
-    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+def render_rows(shape, store, rows, offsets, target=None):
+    """Queue the given store rows as instances of a shared shape.
+
+    offsets are drawn positions, see drawn_offsets.
+    """
+    if not len(rows):
+        return
+    target = target or renderer
+    if viewport.isLod():
+        # Muy alejado: un punto por agente en vez de su figura
+        target.addSprites(offsets, store.color[rows])
+        return
+    target.add(shape, offsets / shape.weight, store.theta[rows], store.scale[rows], store.color[rows])
+
+def static_box_mask():
+    """Only boxes a robot is carrying move; waiting and delivered ones stay put."""
+    return box_store.status[current_rows["boxes"]] != STATUS_TAKEN
+
+def static_signature():
+    """Status and position of everything in the static layer.
+
+    The view is not part of it: the whole layer is recorded and GL clips
+    it, so panning and zooming replay the same list. Only crossing the
+    LOD threshold, which swaps shapes for points, records it again.
+    """
+    box_rows = current_rows["boxes"]
+    return (
+        box_store.status[box_rows].tobytes(),
+        box_store.pos[box_rows].tobytes(),
+        storage_store.pos[current_rows["storages"]].tobytes(),
+        viewport.isLod()
+    )
+
+def draw_static():
+    """Floor, axes, storages and boxes that are not being carried."""
     glColor3f(0.3, 0.3, 0.3)
     glBegin(GL_QUADS)
     glVertex3d(0, 0, -DIM_BOARD)
@@ -109,154 +187,306 @@ def display(robots_data, boxes_data, storages_data):
     glVertex3d(0, 0, DIM_BOARD)
     glVertex3d(0, 0, -DIM_BOARD)
     glEnd()
+    Axis()
+
+    # Sin recorte por vista: la lista sirve para cualquier pan/zoom
+    rows = current_rows["boxes"][static_box_mask()]
+    render_rows(Box.SHAPE, box_store, rows, drawn_offsets(Box.SHAPE, box_store.pos[rows], BOX_SCALE), static_renderer)
+
+    rows = current_rows["storages"]
+    render_rows(Box.SHAPE, storage_store, rows, drawn_offsets(Box.SHAPE, storage_store.pos[rows], BOX_SCALE), static_renderer)
+
+    static_renderer.draw()
+
+def queue_dynamic(robot_poses=None):
+    """Turn state machine, culling and queueing of robots and carried boxes.
+
+    robot_poses, from SimClock.robotPoses, gives interpolated grid positions
+    and angles for the robots, in the order of the last snapshot.
+    """
+    rows = current_rows["robots"]
+    # Sólo en depuración: los argumentos copian arreglos en cada cuadro
+    debug = stats.verbosity >= DEBUG
+    if debug:
+        stats.log(DEBUG, robot_store.orientation[rows])
+        stats.log(DEBUG, "Dx", robot_store.dx[rows], "Dy", robot_store.dy[rows])
+        stats.log(DEBUG, "Counter", robot_store.counter[rows])
+
+    # Máquina de giros para todos los robots a la vez
+    turning, orientations = robot_store.turn(rows)
+    stats.count("turns", len(turning))
+    if debug:
+        for row, orientation in zip(turning, orientations):
+            stats.log(DEBUG, f"r{row}", "Girando a", TURN_NAMES[orientation])
+
+    if robot_poses is not None:
+        # Posición y ángulo interpolados por el reloj de simulación
+        offsets = drawn_offsets(Robot.SHAPE, robot_poses[0], ROBOT_SCALE)
+        robot_store.theta[rows] = robot_poses[1]
+        # El hash tiene las posiciones del snapshot, no las interpoladas
+        visible = in_view(offsets)
+    else:
+        # Traslación a la celda, repetida una vez más por cada paso de giro pendiente
+        repeats = 1 + robot_store.remRotation[rows] // np.abs(robot_store.deltaTheta[rows])
+        offsets = drawn_offsets(Robot.SHAPE, robot_store.pos[rows], ROBOT_SCALE) * repeats[:, None]
+        # El hash tiene la posición sin repetir; los que giran se revisan aparte
+        visible = np.where(repeats == 1, visible_mask("robots"), in_view(offsets))
+
+    stats.count("drawn", int(visible.sum()))
+    # Una sola llamada vectorizada transforma todos los robots visibles
+    render_rows(Robot.SHAPE, robot_store, rows[visible], offsets[visible])
+    # Todos siguen girando, se vean o no
+    robot_store.update(rows)
+
+    # Sólo las cajas que van en un robot se dibujan cada cuadro
+    box_rows = current_rows["boxes"][visible_mask("boxes") & ~static_box_mask()]
+    render_rows(Box.SHAPE, box_store, box_rows, drawn_offsets(Box.SHAPE, box_store.pos[box_rows], BOX_SCALE))
+
+def display(robot_poses=None):
+    """Render the entire scene with robots, boxes, and storages."""
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    # Lo que no se mueve se graba una vez y se rehace sólo si cambia
+    static_layer.draw(static_signature(), draw_static)
 
-    for i, car in enumerate(robots_data):
-        robot = robots[f"r{i}"]
-        robot.setColor(1.0, 1.0, 1.0)
-        robot.setScale(0.5)
-
-        current_pos_x = car["pos"][0]
-        current_pos_y = car["pos"][1]
-
-        current_dx = robotsDx[f"r{i}"]
-        current_dy = robotsDy[f"r{i}"]
-        
-        current_counter = robotsCounter[f"r{i}"]
-
-        print(robot, "Dx", current_dx, "Dy", current_dy)
-        
-        current_orientation = robotOrientation[f"r{i}"]
-
-        print(robot, current_counter)
-        
-        if current_counter != 0:
-            if current_orientation == 0.0:  # Viendo "Y+"
-                if current_dx == 1: 
-                    print(robot,"Girando a X+")
-                    robot.turnRight()
-                    robotOrientation[f"r{i}"] = 3  # Viendo "X+"
-                elif current_dx == -1:  
-                    print(robot,"Girando a X-")
-                    robot.turnLeft()
-                    robotOrientation[f"r{i}"] = 1  # Viendo "X-"
-                elif current_dy == -1: 
-                    print(robot,"Girando a Y-")
-                    robot.turnRight()
-                    robot.turnRight()
-                    robotOrientation[f"r{i}"] = 2  # Viendo "Y-"
-            elif current_orientation == 1:  # Viendo "X-"
-                if current_dy == 1.0: 
-                    print(robot,"Girando a Y+")
-                    robot.turnRight()
-                    robotOrientation[f"r{i}"] = 0  # Viendo "Y+"
-                elif current_dy == -1: 
-                    robot.turnLeft()
-                    robotOrientation[f"r{i}"] = 2  # Viendo "Y-"
-            elif current_orientation == 2.0:  # Viendo "Y-"
-                if current_dx == 1: 
-                    print(robot,"Girando a X+")
-                    robot.turnLeft()
-                    robotOrientation[f"r{i}"] = 3  # Viendo "X+"
-                elif current_dx == -1: 
-                    print(robot,"Girando a X-")
-                    robot.turnRight()
-                    robotOrientation[f"r{i}"] = 1  # Viendo "X-"
-                elif current_dy == 1: 
-                    print(robot,"Girando a Y+")
-                    robot.turnRight()
-                    robot.turnRight()
-                    robotOrientation[f"r{i}"] = 0  # Viendo "Y+"
-            elif current_orientation == 3.0:  # Viendo "X+"
-                if current_dy == 1:
-                    print(robot,"Girando a Y+")
-                    robot.turnLeft()
-                    robotOrientation[f"r{i}"] = 0  # Viendo "Y+"
-                elif current_dy == -1: 
-                    print(robot,"Girando a Y-")
-                    robot.turnRight()
-                    robotOrientation[f"r{i}"] = 2  # Viendo "Y-"
-
-        glPushMatrix()
-        robot.opera.translate(current_pos_x * ROBOT_SCALE, current_pos_y * ROBOT_SCALE)
-        for _ in range(int(robot.remRotation / abs(robot.delta_theta))):
-            robot.opera.translate(current_pos_x * ROBOT_SCALE, current_pos_y * ROBOT_SCALE)
-        robot.render()
-        glPopMatrix()
-
-    for i, box in enumerate(boxes_data):
-        package = packages[f"b{i}"]
-        package.setColor(1.0, 1.0, 0.0)
-        glPushMatrix()
-        package.opera.translate(box["pos"][0] * BOX_SCALE, box["pos"][1] * BOX_SCALE)
-        package.render()
-        glPopMatrix()
-
-    for i, storage in enumerate(storages_data):
-        storage_obj = storages[f"s{i}"]
-        storage_obj.setColor(0.0, 1.0, 1.0)
-        glPushMatrix()
-        storage_obj.opera.translate(storage["pos"][0] * BOX_SCALE, storage["pos"][1] * BOX_SCALE)
-        storage_obj.render()
-        glPopMatrix()
-
-    pygame.display.flip()
+    queue_dynamic(robot_poses)
+    # Un draw instanciado por figura (o un glDrawArrays en el camino de CPU)
+    renderer.draw()
+
+    if overlay.visible:
+        overlay.draw(stats.overlayLines)
+
+    with stats.phase("flip"):
+        pygame.display.flip()
+
+def simulate_frame():
+    """Headless frame: the same state, transform and raster work, without OpenGL."""
+    queue_dynamic()
+    renderer.draw(present=False)
 
 def handle_input():
     """Handle keyboard input."""
     keys = pygame.key.get_pressed()
+    moved = False
     if keys[pygame.K_UP]:
-        pass
+        viewport.pan(0, PAN_STEP)
+        moved = True
     if keys[pygame.K_DOWN]:
-        pass
+        viewport.pan(0, -PAN_STEP)
+        moved = True
     if keys[pygame.K_LEFT]:
-        pass
+        viewport.pan(-PAN_STEP, 0)
+        moved = True
     if keys[pygame.K_RIGHT]:
-        pass
+        viewport.pan(PAN_STEP, 0)
+        moved = True
+    if keys[pygame.K_EQUALS] or keys[pygame.K_PLUS] or keys[pygame.K_PAGEUP]:
+        viewport.zoomBy(ZOOM_STEP)
+        moved = True
+    if keys[pygame.K_MINUS] or keys[pygame.K_PAGEDOWN]:
+        viewport.zoomBy(1 / ZOOM_STEP)
+        moved = True
+    if moved:
+        viewport.apply()
 
 def init_opengl():
     """Initialize OpenGL settings."""
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), DOUBLEBUF | OPENGL)
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), DOUBLEBUF | OPENGL, vsync=1)
     pygame.display.set_caption("OpenGL: Amazon Robots")
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    gluOrtho2D(-100, 1000, -100, 1000)
-    glMatrixMode(GL_MODELVIEW)
+    viewport.apply()
     glLoadIdentity()
     glClearColor(0, 0, 0, 0)
     glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
     glShadeModel(GL_FLAT)
     opera.loadId()
 
-# Main Execution
-robots_data, boxes_data, storages_data, location = fetch_data()
-if robots_data:
-    initialize_objects(robots_data, boxes_data, storages_data)
+def load_snapshot(snapshot):
+    """Apply a snapshot (lists of agent dicts or columns) to the entity stores."""
+    with stats.phase("update"):
+        # Escrituras vectorizadas al almacén de entidades
+        load_agents(snapshot["robots"], snapshot["boxes"], snapshot["storages"])
+        refresh_spatial_hashes()
+
+def start_simulation(url_base, binary=BINARY):
+    """Start a simulation on the server; returns (first snapshot, location)."""
+    robots_data, boxes_data, storages_data, location = fetch_data(url_base, binary)
+    if robots_data is None:
+        return None, None
+    return {"robots": robots_data, "boxes": boxes_data, "storages": storages_data}, location
+
+def replay_range(reader, args):
+    end = len(reader) if args.steps is None else min(len(reader), args.start + args.steps)
+    return range(args.start, end)
+
+def run_headless(args, recorder=None):
+    """Process snapshots as fast as possible, with no window."""
+    if args.replay:
+        reader = TraceReader(args.replay)
+        for step in replay_range(reader, args):
+            # Columnas del registro mapeado, sin armar un dict por agente
+            snapshot = reader.columns(step)
+            load_snapshot(snapshot)
+            if recorder:
+                recorder.write(snapshot)
+            simulate_frame()
+            stats.endFrame()
+        reader.close()
+        return
+
+    snapshot, location = start_simulation(args.url, args.binary)
+    if snapshot is None:
+        return
+    # Peticiones en el mismo hilo: un paso del servidor por cuadro
+    fetcher = Fetcher(args.url + location, binary=args.binary, stats=stats)
+    steps = 0
+    while snapshot is not None and (args.steps is None or steps < args.steps):
+        if recorder:
+            recorder.write(snapshot)
+        load_snapshot(snapshot)
+        simulate_frame()
+        stats.endFrame()
+        steps += 1
+        snapshot, (network, decode) = fetcher.fetch()
+        stats.add("network", network)
+        stats.add("decode", decode)
+    fetcher.session.close()
+    stats.count("fetch_errors", fetcher.errors)
+
+def run_window(args, recorder=None):
+    """Render the simulation, live from the server or replayed from a trace."""
+    reader = fetcher = steps = None
+    if args.replay:
+        reader = TraceReader(args.replay)
+        steps = replay_range(reader, args)
+        if not len(steps):
+            return
+        snapshot = reader.columns(steps.start)
+        if recorder:
+            recorder.write(snapshot)
+    else:
+        snapshot, location = start_simulation(args.url, args.binary)
+        if snapshot is None:
+            return
+        if recorder:
+            recorder.write(snapshot)
+        # Las actualizaciones llegan desde un hilo aparte, sin bloquear el render;
+        # ese hilo graba cada respuesta, la tome el render o no
+        fetcher = Fetcher(
+            args.url + location, UPDATE_INTERVAL, binary=args.binary, stats=stats,
+            recorder=recorder
+        ).start()
+
+    try:
+        loop_window(args, snapshot, reader, fetcher, recorder, steps)
+    finally:
+        if fetcher:
+            fetcher.stop()
+            stats.count("fetch_errors", fetcher.errors)
+        if reader:
+            reader.close()
+
+def loop_window(args, snapshot, reader, fetcher, recorder, steps):
+    """Window loop of run_window; reader and steps are only set when replaying."""
+    pygame.init()
     init_opengl()
 
-    # Set your desired update interval and frame delay here
-    UPDATE_INTERVAL = 1  # Update data every 500 milliseconds
-    FRAME_DELAY = 1       # Frame delay set to 30 milliseconds
+    # Un snapshot por tick; el render interpola entre los dos últimos
+    sim_clock = SimClock(UPDATE_INTERVAL)
+    sim_clock.push(snapshot)
+    step = steps.start if reader else None
+    snapshots = 1
+    frame_clock = pygame.time.Clock()
 
     done = False
     while not done:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 done = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                overlay.toggle()
+            elif reader and event.type == pygame.KEYDOWN and event.key in (pygame.K_COMMA, pygame.K_PERIOD):
+                # Salta por el trace sin interpolar desde el paso anterior
+                jump = SCRUB_STEP if event.key == pygame.K_PERIOD else -SCRUB_STEP
+                step = min(max(step + jump, steps.start), steps.stop - 1)
+                sim_clock = SimClock(UPDATE_INTERVAL)
+                sim_clock.push(reader.columns(step))
 
         handle_input()
-        Axis()
-        display(robots_data, boxes_data, storages_data)
 
-        # Update data every UPDATE_INTERVAL milliseconds
-        if pygame.time.get_ticks() % UPDATE_INTERVAL == 0:
-            new_data = update_data(location)
+        new_data = None
+        if fetcher:
+            # Take the newest snapshot, fetched at most every UPDATE_INTERVAL seconds
+            new_data = fetcher.take()
             if new_data:
-                robots_data = new_data["robots"]
-                boxes_data = new_data["boxes"]
-                storages_data = new_data["storages"]
-                update_robot_positions(robots_data)
+                # Red y JSON se miden en el hilo del Fetcher
+                network, decode = fetcher.timings
+                stats.add("network", network)
+                stats.add("decode", decode)
+        elif len(sim_clock.pending) < 2 and step + 1 < steps.stop:
+            # El reloj consume uno por tick; basta con tener el siguiente listo
+            step += 1
+            new_data = reader.columns(step)
+            if recorder:
+                recorder.write(new_data)
+        if new_data:
+            sim_clock.push(new_data)
+            stats.count("snapshots")
+            snapshots += 1
+        if sim_clock.advance():
+            load_snapshot(sim_clock.current)
+
+        display(sim_clock.robotPoses())
+
+        # Render at the display's refresh rate, capped at MAX_FPS
+        frame_clock.tick(MAX_FPS)
+        stats.endFrame()
+        if args.steps is not None and not reader and snapshots >= args.steps:
+            done = True
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Amazon Robots client")
+    parser.add_argument("--url", default=URL_BASE, help="simulation server")
+    parser.add_argument("--json", dest="binary", action="store_false", default=BINARY,
+                        help="ask the server for JSON snapshots instead of the binary format")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window: process snapshots as fast as possible")
+    parser.add_argument("--record", metavar="TRACE", help="record every snapshot to a trace file")
+    parser.add_argument("--replay", metavar="TRACE", help="replay a trace file instead of the server")
+    parser.add_argument("--start", type=int, default=0, help="first trace step to replay")
+    parser.add_argument("--steps", type=int, default=None, help="stop after this many snapshots")
+    parser.add_argument("--verbosity", type=int, default=None,
+                        help="0 quiet, 1 errors and summaries, 2 per-frame debug output")
+    parser.add_argument("--stats-file", default=STATS_FILE, help="export frame stats to .csv or .json")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Sin ventana, el resumen final es la salida
+    default_verbosity = max(VERBOSITY, SUMMARY) if args.headless else VERBOSITY
+    stats.verbosity = default_verbosity if args.verbosity is None else args.verbosity
+    stats.path = args.stats_file
+
+    recorder = TraceWriter(args.record) if args.record else None
+    try:
+        if args.headless:
+            run_headless(args, recorder)
+        else:
+            run_window(args, recorder)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recorder:
+            recorder.close()
+            stats.log(SUMMARY, "Trace:", args.record, recorder.steps, "steps")
+
+    if stats.path:
+        stats.export()
+
+    # Cuánto trabajo de transformación se ahorró
+    stats.log(SUMMARY, "Transform cache:", transform_cache.info())
+    stats.log(SUMMARY, "Static layer:", static_layer.info())
+    stats.log(SUMMARY, "Frame stats:", stats.summary())
 
-        # Reduce delay to FRAME_DELAY for a faster frame rate
-        pygame.time.wait(FRAME_DELAY)
+    pygame.quit()
 
-pygame.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1 +1,11 @@
 from .main import Packer, Bin, Item
+from .constants import (
+    RotationType, Axis, PivotStrategy, EvictionPolicy, DistributionStrategy
+)
+from .batch import pack_order, iter_pack_orders, pack_orders
+from .cache import PackingCache
+from .online import OnlinePacker
+from .stats import PackingStats
+from .selection import select_bin
+from .distribution import distribute
+from .search import AnytimeSearch, improve
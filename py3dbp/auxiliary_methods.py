@@ -5,16 +5,15 @@ from .constants import Axis
 def rect_intersect(item1, item2, x, y):
     d1 = item1.get_dimension()
     d2 = item2.get_dimension()
+    p1 = item1.position
+    p2 = item2.position
 
-    cx1 = item1.position[x] + d1[x]/2
-    cy1 = item1.position[y] + d1[y]/2
-    cx2 = item2.position[x] + d2[x]/2
-    cy2 = item2.position[y] + d2[y]/2
-
-    ix = max(cx1, cx2) - min(cx1, cx2)
-    iy = max(cy1, cy2) - min(cy1, cy2)
-
-    return ix < (d1[x]+d2[x])/2 and iy < (d1[y]+d2[y])/2
+    # Same test as comparing centre distances against half extents, written
+    # without the divisions so integer (fixed-point) coordinates stay ints.
+    return (
+        p1[x] < p2[x] + d2[x] and p2[x] < p1[x] + d1[x] and
+        p1[y] < p2[y] + d2[y] and p2[y] < p1[y] + d1[y]
+    )
 
 
 def intersect(item1, item2):
@@ -33,3 +32,27 @@ def set_to_decimal(value, number_of_decimals):
     number_of_decimals = get_limit_number_of_decimals(number_of_decimals)
 
     return Decimal(value).quantize(number_of_decimals)
+
+
+def set_to_fixed_point(value, number_of_decimals):
+    return int(
+        set_to_decimal(value, number_of_decimals).scaleb(number_of_decimals)
+    )
+
+
+def fixed_point_to_decimal(value, number_of_decimals):
+    return set_to_decimal(
+        Decimal(value).scaleb(-number_of_decimals), number_of_decimals
+    )
+
+
+def get_fixed_point_volume(width, height, depth, number_of_decimals):
+    # The product carries the scale three times; bring it back to one scale
+    # rounding half to even, exactly like Decimal.quantize does.
+    scale = 10 ** (2 * number_of_decimals)
+    quotient, remainder = divmod(width * height * depth, scale)
+
+    if 2 * remainder > scale or (2 * remainder == scale and quotient % 2):
+        quotient += 1
+
+    return quotient
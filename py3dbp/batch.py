@@ -0,0 +1,194 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .main import Packer, Bin, Item
+from .auxiliary_methods import fixed_point_to_decimal
+
+
+def get_output_position(item):
+    if item.fixed_point:
+        return tuple(
+            fixed_point_to_decimal(value, item.number_of_decimals)
+            for value in item.position
+        )
+
+    return tuple(item.position)
+
+
+def pack_order(order, pack_options):
+    """Pack one (bin specs, item specs) order and return a compact result.
+
+    Bin specs are (name, width, height, depth, max_weight) and item specs are
+    (name, width, height, depth, weight). The result holds one
+    (bin index, fitted, unfitted) tuple per bin, in packing order: fitted
+    holds (item index, position, rotation type) and unfitted holds item
+    indices. Indices point into the order's own bin and item specs.
+    """
+    bin_specs, item_specs = order
+    packer = Packer()
+    bin_indices = {}
+    item_indices = {}
+
+    for index, spec in enumerate(bin_specs):
+        bin = Bin(*spec)
+        bin_indices[id(bin)] = index
+        packer.add_bin(bin)
+
+    for index, spec in enumerate(item_specs):
+        item = Item(*spec)
+        item_indices[id(item)] = index
+        packer.add_item(item)
+
+    packer.pack(**pack_options)
+
+    return tuple(
+        (
+            bin_indices[id(bin)],
+            tuple(
+                (
+                    item_indices[id(item)], get_output_position(item),
+                    item.rotation_type
+                )
+                for item in bin.items
+            ),
+            tuple(item_indices[id(item)] for item in bin.unfitted_items)
+        )
+        for bin in packer.bins
+    )
+
+
+def pack_order_chunk(orders, pack_options):
+    return [pack_order(order, pack_options) for order in orders]
+
+
+def iter_pack_orders(
+    orders, max_workers=None, window=None, chunksize=1, **pack_options
+):
+    """Pack independent orders on a process pool, yielding results in order.
+
+    At most window chunks of chunksize orders are in flight at a time, so
+    orders may be a lazy iterable of any length. pack_options are passed to
+    Packer.pack for every order.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    window = window or 2 * max_workers
+    orders = iter(orders)
+
+    def next_chunk():
+        chunk = []
+        for order in orders:
+            chunk.append(order)
+            if len(chunk) == chunksize:
+                break
+        return chunk
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        in_flight = deque()
+
+        while True:
+            while len(in_flight) < window:
+                chunk = next_chunk()
+                if not chunk:
+                    break
+                in_flight.append(
+                    executor.submit(pack_order_chunk, chunk, pack_options)
+                )
+
+            if not in_flight:
+                break
+
+            for result in in_flight.popleft().result():
+                yield result
+
+
+def pack_orders(
+    orders, max_workers=None, window=None, chunksize=1, **pack_options
+):
+    return list(iter_pack_orders(
+        orders, max_workers, window, chunksize, **pack_options
+    ))
+
+
+def get_item_spec(item):
+    values = (item.width, item.height, item.depth, item.weight)
+
+    if item.fixed_point:
+        values = tuple(
+            fixed_point_to_decimal(value, item.number_of_decimals)
+            for value in values
+        )
+
+    return (item.name,) + tuple(values)
+
+
+def get_bin_spec(bin):
+    values = (bin.width, bin.height, bin.depth, bin.max_weight)
+
+    if bin.fixed_point:
+        values = tuple(
+            fixed_point_to_decimal(value, bin.number_of_decimals)
+            for value in values
+        )
+
+    return (bin.name,) + tuple(values)
+
+
+def pack_bin_state(bin_spec, item_specs, pack_options):
+    # Every item is tried in the bin, so report the state each one is left
+    # in; position is None where the bin never moved the item. No pivot is
+    # negative, which makes the start position recognisable afterwards.
+    packer = Packer()
+    packer.add_bin(Bin(*bin_spec))
+    items = [Item(*spec) for spec in item_specs]
+
+    for item in items:
+        item.position = [-1, -1, -1]
+        packer.add_item(item)
+
+    packer.pack(**pack_options)
+    bin = packer.bins[0]
+    item_indices = {id(item): index for index, item in enumerate(items)}
+
+    return (
+        [item_indices[id(item)] for item in bin.items],
+        [item_indices[id(item)] for item in bin.unfitted_items],
+        [
+            (
+                list(item.position) if item.position[0] >= 0 else None,
+                item.rotation_type
+            )
+            for item in items
+        ]
+    )
+
+
+def pack_bins_in_parallel(packer, max_workers, **pack_options):
+    """Pack each of packer's already formatted and sorted bins separately.
+
+    Bins never share state while packing unless items are distributed, so
+    the results are applied back in bin order to reproduce a serial pack.
+    """
+    item_specs = [get_item_spec(item) for item in packer.items]
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = [
+            executor.submit(
+                pack_bin_state, get_bin_spec(bin), item_specs, pack_options
+            )
+            for bin in packer.bins
+        ]
+
+        for bin, future in zip(packer.bins, futures):
+            fitted, unfitted, item_states = future.result()
+            bin.items.extend(packer.items[index] for index in fitted)
+            bin.unfitted_items.extend(
+                packer.items[index] for index in unfitted
+            )
+
+            for item, (position, rotation_type) in zip(
+                packer.items, item_states
+            ):
+                if position is not None:
+                    item.position = position
+                item.rotation_type = rotation_type
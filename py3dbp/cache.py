@@ -0,0 +1,121 @@
+from collections import OrderedDict
+
+from .constants import EvictionPolicy
+
+
+class PackingCache:
+    """Bounded map from order signatures to packing results.
+
+    One cache can be shared by many Packer instances, e.g.
+    Packer(cache=shared_cache), so repeated orders are only packed once.
+    """
+
+    def __init__(self, maxsize=128, eviction=EvictionPolicy.LRU):
+        if eviction not in EvictionPolicy.ALL:
+            raise ValueError("Unknown eviction policy: {}".format(eviction))
+
+        self.maxsize = maxsize
+        self.eviction = eviction
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.results)
+
+    def get(self, key):
+        result = self.results.get(key)
+
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.eviction == EvictionPolicy.LRU:
+            self.results.move_to_end(key)
+
+        return result
+
+    def put(self, key, result):
+        if self.maxsize <= 0:
+            return
+
+        self.results[key] = result
+        self.results.move_to_end(key)
+
+        while len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.results.clear()
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.results),
+            'maxsize': self.maxsize,
+            'eviction': self.eviction,
+        }
+
+
+def get_signature(packer, **pack_options):
+    # Items are taken in packing order: sorted by volume, with equal volumes
+    # left in insertion order, since that order decides the placements.
+    return (
+        tuple(
+            (item.width, item.height, item.depth, item.weight)
+            for item in packer.items
+        ),
+        tuple(
+            (bin.width, bin.height, bin.depth, bin.max_weight)
+            for bin in packer.bins
+        ),
+        tuple(sorted(pack_options.items())),
+    )
+
+
+def record_result(packer, items, start_positions):
+    # Only positions the pack changed are kept, so a hit leaves untouched
+    # items exactly as a real pack would. start_positions are copies taken
+    # before packing and are compared by value, since pivots such as
+    # START_POSITION are shared lists.
+    item_indices = {id(item): index for index, item in enumerate(items)}
+
+    return (
+        tuple(
+            (
+                tuple(item_indices[id(item)] for item in bin.items),
+                tuple(item_indices[id(item)] for item in bin.unfitted_items)
+            )
+            for bin in packer.bins
+        ),
+        tuple(
+            (
+                None if item.position == start_position
+                else tuple(item.position),
+                item.rotation_type
+            )
+            for item, start_position in zip(items, start_positions)
+        ),
+        tuple(item_indices[id(item)] for item in packer.items),
+    )
+
+
+def apply_result(packer, result):
+    bin_results, item_states, remaining = result
+    items = list(packer.items)
+
+    for bin, (fitted, unfitted) in zip(packer.bins, bin_results):
+        bin.items.extend(items[index] for index in fitted)
+        bin.unfitted_items.extend(items[index] for index in unfitted)
+
+    for item, (position, rotation_type) in zip(items, item_states):
+        if position is not None:
+            item.position = list(position)
+        item.rotation_type = rotation_type
+
+    packer.items = [items[index] for index in remaining]
@@ -0,0 +1,96 @@
+from bisect import bisect_left
+
+from .constants import Axis
+
+
+class CandidatePoints:
+    def __init__(self, width, height, depth):
+        self.bin_dimension = [width, height, depth]
+        # Points are kept as (depth, height, width) tuples so the sorted order
+        # fills each layer row by row, nearest the origin first.
+        self.points = []
+        self.min_dimension = 0
+        self.number_of_items = 0
+
+    def __len__(self):
+        return len(self.points)
+
+    def __iter__(self):
+        for z, y, x in self.points:
+            yield [x, y, z]
+
+    def get_pivots(self):
+        return list(self)
+
+    def is_useful(self, point):
+        return all(
+            self.bin_dimension[axis] - point[axis] >= self.min_dimension
+            for axis in Axis.ALL
+        )
+
+    def add(self, point, placed_items=()):
+        key = (point[2], point[1], point[0])
+        index = bisect_left(self.points, key)
+
+        if index < len(self.points) and self.points[index] == key:
+            return
+
+        if not self.is_useful(point):
+            return
+
+        for placed_item in placed_items:
+            if contains(placed_item, point):
+                return
+
+        self.points.insert(index, key)
+
+    def update(self, item, placed_items=()):
+        """Account for item having just been placed.
+
+        placed_items only needs to hold the items that may contain one of the
+        new points, e.g. the result of a spatial index query.
+        """
+        self.points = [
+            key for key in self.points
+            if not contains(item, (key[2], key[1], key[0]))
+        ]
+        for point in get_extreme_points(item):
+            self.add(point, placed_items)
+
+        self.number_of_items += 1
+
+    def prune(self, min_dimension):
+        """Drop points leaving less room than min_dimension on some axis.
+
+        min_dimension may only grow, because pruned points are gone for good.
+        """
+        if min_dimension <= self.min_dimension:
+            return
+
+        self.min_dimension = min_dimension
+        self.points = [
+            key for key in self.points
+            if self.is_useful((key[2], key[1], key[0]))
+        ]
+
+
+def contains(item, point):
+    dimension = item.get_dimension()
+
+    return all(
+        item.position[axis] <= point[axis] <
+        item.position[axis] + dimension[axis]
+        for axis in Axis.ALL
+    )
+
+
+def get_extreme_points(item):
+    dimension = item.get_dimension()
+    points = []
+
+    for axis in Axis.ALL:
+        point = list(item.position)
+        point[axis] += dimension[axis]
+        points.append(point)
+
+    return points
@@ -15,3 +15,24 @@ class Axis:
     DEPTH = 2
 
     ALL = [WIDTH, HEIGHT, DEPTH]
+
+
+class PivotStrategy:
+    ITEM_CORNERS = 'item_corners'
+    EXTREME_POINTS = 'extreme_points'
+
+    ALL = [ITEM_CORNERS, EXTREME_POINTS]
+
+
+class EvictionPolicy:
+    LRU = 'lru'
+    FIFO = 'fifo'
+
+    ALL = [LRU, FIFO]
+
+
+class DistributionStrategy:
+    FIRST_FIT_DECREASING = 'first_fit_decreasing'
+    BEST_FIT_DECREASING = 'best_fit_decreasing'
+
+    ALL = [FIRST_FIT_DECREASING, BEST_FIT_DECREASING]
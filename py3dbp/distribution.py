@@ -0,0 +1,88 @@
+from .constants import DistributionStrategy, PivotStrategy
+from .main import (
+    DEFAULT_NUMBER_OF_DECIMALS, RemainingItems, get_remaining_min_dimensions
+)
+from .selection import get_rejection
+
+
+def distribute(
+    packer, strategy=DistributionStrategy.FIRST_FIT_DECREASING,
+    number_of_decimals=DEFAULT_NUMBER_OF_DECIMALS, fixed_point=False,
+    vectorized=False, pivot_strategy=PivotStrategy.EXTREME_POINTS
+):
+    """Spread packer's items over its bins, largest item first.
+
+    Each item is tried once per bin at most. With first-fit-decreasing it
+    goes into the first bin, in packer.bins order, that takes it. With
+    best-fit-decreasing it goes into the bin with the least free volume that
+    takes it. Bins whose free volume or weight cannot take the item, or
+    that turned down an item of the same shape and have not changed since,
+    are skipped without being packed. Items that fit nowhere are left in
+    packer.items and packer.unfit_items. Returns (bin, fill ratio) pairs in
+    packer.bins order.
+    """
+    if strategy not in DistributionStrategy.ALL:
+        raise ValueError("Unknown distribution strategy: {}".format(strategy))
+
+    packer.vectorized = vectorized
+    packer.pivot_strategy = pivot_strategy
+
+    for bin in packer.bins:
+        bin.format_numbers(number_of_decimals, fixed_point)
+
+    for item in packer.items:
+        item.format_numbers(number_of_decimals, fixed_point)
+
+    items = sorted(
+        packer.items, key=lambda item: item.get_volume(), reverse=True
+    )
+    remaining = RemainingItems(items)
+    free_volumes = {}
+    free_weights = {}
+    # Shapes that failed in a bin, with the number of items the bin held at
+    # the time; the same shape fails again until the bin changes.
+    failed_shapes = {id(bin): {} for bin in packer.bins}
+
+    for bin in packer.bins:
+        free_volumes[id(bin)] = bin.width * bin.height * bin.depth - sum(
+            item.width * item.height * item.depth for item in bin.items
+        )
+        free_weights[id(bin)] = bin.max_weight - bin.get_total_weight()
+
+    remaining_min_dimensions = get_remaining_min_dimensions(items)
+
+    for index, item in enumerate(items):
+        volume = item.width * item.height * item.depth
+        shape = (item.width, item.height, item.depth, item.weight)
+        bins = packer.bins
+
+        if pivot_strategy == PivotStrategy.EXTREME_POINTS:
+            for bin in bins:
+                bin.get_candidate_points().prune(
+                    remaining_min_dimensions[index]
+                )
+
+        if strategy == DistributionStrategy.BEST_FIT_DECREASING:
+            bins = sorted(bins, key=lambda bin: free_volumes[id(bin)])
+
+        for bin in bins:
+            if (
+                volume > free_volumes[id(bin)] or
+                item.weight > free_weights[id(bin)] or
+                failed_shapes[id(bin)].get(shape) == len(bin.items) or
+                get_rejection(bin, [item]) is not None
+            ):
+                continue
+
+            if packer.fit_to_bin(bin, item):
+                remaining.remove(item)
+                free_volumes[id(bin)] -= volume
+                free_weights[id(bin)] -= item.weight
+                break
+
+            failed_shapes[id(bin)][shape] = len(bin.items)
+
+    packer.items = list(remaining)
+    packer.unfit_items = list(remaining)
+
+    return [(bin, bin.get_fill_ratio()) for bin in packer.bins]
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+def get_output_values(item):
+    values = list(item.position) + item.get_dimension()
+
+    if item.fixed_point:
+        scale = 10 ** item.number_of_decimals
+        return [value / scale for value in values]
+
+    return values
+
+
+def export_arrays(bins):
+    """Return the placements in bins as contiguous NumPy arrays.
+
+    There is one row per fitted item: bin_index points into bins,
+    item_index into names, position holds (x, y, z) and dimension the
+    rotated (width, height, depth), both as float64 in the input units.
+    unfitted_bin_index and unfitted_item_index list the unfitted items the
+    same way. bin_names and names are plain lists.
+    """
+    names = []
+    item_indices = {}
+
+    def get_item_index(item):
+        index = item_indices.get(id(item))
+
+        if index is None:
+            index = item_indices[id(item)] = len(names)
+            names.append(item.name)
+
+        return index
+
+    bin_index = []
+    item_index = []
+    rotation_type = []
+    values = []
+    unfitted_bin_index = []
+    unfitted_item_index = []
+
+    for index, bin in enumerate(bins):
+        for item in bin.items:
+            bin_index.append(index)
+            item_index.append(get_item_index(item))
+            rotation_type.append(item.rotation_type)
+            values.append(get_output_values(item))
+
+        for item in bin.unfitted_items:
+            unfitted_bin_index.append(index)
+            unfitted_item_index.append(get_item_index(item))
+
+    values = np.array(values, dtype=np.float64).reshape(-1, 6)
+
+    return {
+        'bin_index': np.array(bin_index, dtype=np.int64),
+        'item_index': np.array(item_index, dtype=np.int64),
+        'position': np.ascontiguousarray(values[:, :3]),
+        'rotation_type': np.array(rotation_type, dtype=np.int8),
+        'dimension': np.ascontiguousarray(values[:, 3:]),
+        'unfitted_bin_index': np.array(unfitted_bin_index, dtype=np.int64),
+        'unfitted_item_index': np.array(
+            unfitted_item_index, dtype=np.int64
+        ),
+        'bin_names': [bin.name for bin in bins],
+        'names': names,
+    }
@@ -1,38 +1,141 @@
-from .constants import RotationType, Axis
-from .auxiliary_methods import intersect, set_to_decimal
+from time import perf_counter
+
+from .constants import RotationType, Axis, PivotStrategy
+from .auxiliary_methods import (
+    intersect, set_to_decimal, set_to_fixed_point, fixed_point_to_decimal,
+    get_fixed_point_volume
+)
+from .spatial_index import SpatialGrid
+from .candidate_points import CandidatePoints, get_extreme_points
+from .cache import get_signature, record_result, apply_result
 
 DEFAULT_NUMBER_OF_DECIMALS = 3
 START_POSITION = [0, 0, 0]
 
 
+def get_remaining_min_dimensions(items):
+    # Smallest dimension of any item from each position onwards; a candidate
+    # point with less room than that on some axis can no longer be used.
+    remaining_min_dimensions = []
+    min_dimension = None
+
+    for item in reversed(items):
+        dimension = min(item.width, item.height, item.depth)
+        if min_dimension is None or dimension < min_dimension:
+            min_dimension = dimension
+        remaining_min_dimensions.append(min_dimension)
+
+    remaining_min_dimensions.reverse()
+
+    return remaining_min_dimensions
+
+
+class RemainingItems:
+    """Items in insertion order, with O(1) membership tests and removal."""
+
+    def __init__(self, items=()):
+        self.items = {id(item): item for item in items}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return id(item) in self.items
+
+    def __iter__(self):
+        return iter(list(self.items.values()))
+
+    def remove(self, item):
+        del self.items[id(item)]
+
+
 class Item:
-    def __init__(self, name, width, height, depth):
+    def __init__(self, name, width, height, depth, weight=0):
         self.name = name
         self.width = width
         self.height = height
         self.depth = depth
+        self.weight = weight
         self.rotation_type = 0
         self.position = START_POSITION
         self.number_of_decimals = DEFAULT_NUMBER_OF_DECIMALS
+        self.fixed_point = False
+
+    def format_numbers(self, number_of_decimals, fixed_point=False):
+        if self.fixed_point:
+            self.unformat_fixed_point()
+
+        if fixed_point:
+            self.width = set_to_fixed_point(self.width, number_of_decimals)
+            self.height = set_to_fixed_point(self.height, number_of_decimals)
+            self.depth = set_to_fixed_point(self.depth, number_of_decimals)
+            self.weight = set_to_fixed_point(self.weight, number_of_decimals)
+            self.position = [
+                set_to_fixed_point(value, number_of_decimals)
+                for value in self.position
+            ]
+        else:
+            self.width = set_to_decimal(self.width, number_of_decimals)
+            self.height = set_to_decimal(self.height, number_of_decimals)
+            self.depth = set_to_decimal(self.depth, number_of_decimals)
+            self.weight = set_to_decimal(self.weight, number_of_decimals)
 
-    def format_numbers(self, number_of_decimals):
-        self.width = set_to_decimal(self.width, number_of_decimals)
-        self.height = set_to_decimal(self.height, number_of_decimals)
-        self.depth = set_to_decimal(self.depth, number_of_decimals)
-        self.weight = set_to_decimal(self.weight, number_of_decimals)
         self.number_of_decimals = number_of_decimals
+        self.fixed_point = fixed_point
+
+    def unformat_fixed_point(self):
+        self.width, self.height, self.depth, self.weight = [
+            fixed_point_to_decimal(value, self.number_of_decimals)
+            for value in (self.width, self.height, self.depth, self.weight)
+        ]
+        self.position = [
+            fixed_point_to_decimal(value, self.number_of_decimals)
+            for value in self.position
+        ]
+        self.fixed_point = False
 
     def string(self):
+        width, height, depth, weight = (
+            self.width, self.height, self.depth, self.weight
+        )
+        position = self.position
+
+        if self.fixed_point:
+            width, height, depth, weight = [
+                fixed_point_to_decimal(value, self.number_of_decimals)
+                for value in (width, height, depth, weight)
+            ]
+            # Without fixed point, coordinates no pivot moved keep
+            # START_POSITION's int zeros; print them the same way.
+            position = [
+                fixed_point_to_decimal(value, self.number_of_decimals)
+                if value else 0
+                for value in position
+            ]
+
         return "%s(%sx%sx%s, weight: %s) pos(%s) rt(%s) vol(%s)" % (
-            self.name, self.width, self.height, self.depth, self.weight,
-            self.position, self.rotation_type, self.get_volume()
+            self.name, width, height, depth, weight,
+            position, self.rotation_type, self.get_output_volume()
         )
 
     def get_volume(self):
+        if self.fixed_point:
+            return get_fixed_point_volume(
+                self.width, self.height, self.depth, self.number_of_decimals
+            )
+
         return set_to_decimal(
             self.width * self.height * self.depth, self.number_of_decimals
         )
 
+    def get_output_volume(self):
+        if self.fixed_point:
+            return fixed_point_to_decimal(
+                self.get_volume(), self.number_of_decimals
+            )
+
+        return self.get_volume()
+
     def get_dimension(self):
         if self.rotation_type == RotationType.RT_WHD:
             dimension = [self.width, self.height, self.depth]
@@ -62,37 +165,267 @@ class Bin:
         self.items = []
         self.unfitted_items = []
         self.number_of_decimals = DEFAULT_NUMBER_OF_DECIMALS
+        self.fixed_point = False
+        self.spatial_index = None
+        self.placement_evaluator = None
+        self.candidate_points = None
+        self.stats = None
+
+    def format_numbers(self, number_of_decimals, fixed_point=False):
+        if self.fixed_point:
+            self.unformat_fixed_point()
+
+        if fixed_point:
+            self.width = set_to_fixed_point(self.width, number_of_decimals)
+            self.height = set_to_fixed_point(self.height, number_of_decimals)
+            self.depth = set_to_fixed_point(self.depth, number_of_decimals)
+            self.max_weight = set_to_fixed_point(
+                self.max_weight, number_of_decimals
+            )
+        else:
+            self.width = set_to_decimal(self.width, number_of_decimals)
+            self.height = set_to_decimal(self.height, number_of_decimals)
+            self.depth = set_to_decimal(self.depth, number_of_decimals)
+            self.max_weight = set_to_decimal(
+                self.max_weight, number_of_decimals
+            )
 
-    def format_numbers(self, number_of_decimals):
-        self.width = set_to_decimal(self.width, number_of_decimals)
-        self.height = set_to_decimal(self.height, number_of_decimals)
-        self.depth = set_to_decimal(self.depth, number_of_decimals)
-        self.max_weight = set_to_decimal(self.max_weight, number_of_decimals)
         self.number_of_decimals = number_of_decimals
+        self.fixed_point = fixed_point
+        self.spatial_index = None
+        self.placement_evaluator = None
+        self.candidate_points = None
+
+    def unformat_fixed_point(self):
+        self.width, self.height, self.depth, self.max_weight = [
+            fixed_point_to_decimal(value, self.number_of_decimals)
+            for value in (self.width, self.height, self.depth, self.max_weight)
+        ]
+        self.fixed_point = False
 
     def string(self):
+        width, height, depth, max_weight = (
+            self.width, self.height, self.depth, self.max_weight
+        )
+
+        if self.fixed_point:
+            width, height, depth, max_weight = [
+                fixed_point_to_decimal(value, self.number_of_decimals)
+                for value in (width, height, depth, max_weight)
+            ]
+
         return "%s(%sx%sx%s, max_weight:%s) vol(%s)" % (
-            self.name, self.width, self.height, self.depth, self.max_weight,
-            self.get_volume()
+            self.name, width, height, depth, max_weight,
+            self.get_output_volume()
         )
 
     def get_volume(self):
+        if self.fixed_point:
+            return get_fixed_point_volume(
+                self.width, self.height, self.depth, self.number_of_decimals
+            )
+
         return set_to_decimal(
             self.width * self.height * self.depth, self.number_of_decimals
         )
 
+    def get_output_volume(self):
+        if self.fixed_point:
+            return fixed_point_to_decimal(
+                self.get_volume(), self.number_of_decimals
+            )
+
+        return self.get_volume()
+
+    def get_fill_ratio(self):
+        volume = self.width * self.height * self.depth
+
+        if not volume:
+            return 0.0
+
+        return float(sum(
+            item.width * item.height * item.depth for item in self.items
+        ) / volume)
+
     def get_total_weight(self):
         total_weight = 0
 
         for item in self.items:
             total_weight += item.weight
 
+        if self.fixed_point:
+            return total_weight
+
         return set_to_decimal(total_weight, self.number_of_decimals)
 
+    def export_arrays(self):
+        from .export import export_arrays
+
+        return export_arrays([self])
+
+    def get_spatial_index(self, dimension):
+        spatial_index = self.spatial_index
+
+        # Rebuild whenever bin.items was changed behind the index's back.
+        if spatial_index is None or len(spatial_index) != len(self.items):
+            bin_dimension = [self.width, self.height, self.depth]
+            spatial_index = SpatialGrid([
+                dimension[axis] if dimension[axis] > 0 else
+                bin_dimension[axis] if bin_dimension[axis] > 0 else 1
+                for axis in Axis.ALL
+            ])
+
+            for current_item_in_bin in self.items:
+                spatial_index.insert(current_item_in_bin)
+
+            self.spatial_index = spatial_index
+
+        return spatial_index
+
+    def get_candidate_points(self):
+        candidate_points = self.candidate_points
+
+        if (
+            candidate_points is None or
+            candidate_points.number_of_items != len(self.items)
+        ):
+            candidate_points = CandidatePoints(
+                self.width, self.height, self.depth
+            )
+            candidate_points.add(START_POSITION)
+
+            for current_item_in_bin in self.items:
+                candidate_points.update(current_item_in_bin, self.items)
+
+            self.candidate_points = candidate_points
+
+        return candidate_points
+
+    def put_item_at_candidate_point(self, item, vectorized=False):
+        candidate_points = self.get_candidate_points()
+        fitted = False
+
+        if vectorized:
+            fitted = self.put_item_vectorized(
+                item, candidate_points.get_pivots()
+            )
+        else:
+            for pivot in candidate_points:
+                if self.put_item(item, pivot):
+                    fitted = True
+                    break
+
+        if fitted:
+            dimension = item.get_dimension()
+            spatial_index = self.get_spatial_index(dimension)
+            candidate_points.update(
+                item, spatial_index.query(item.position, dimension)
+            )
+
+        return fitted
+
+    def remove_item(self, item):
+        index = self.items.index(item)
+        dimension = item.get_dimension()
+        spatial_index = self.get_spatial_index(dimension)
+        del self.items[index]
+        spatial_index.remove(item)
+
+        if self.placement_evaluator is not None:
+            self.placement_evaluator.remove(index)
+
+        candidate_points = self.candidate_points
+
+        if candidate_points is not None:
+            candidate_points.number_of_items -= 1
+
+            # The freed corner is usable again, and so are the extreme points
+            # of neighbours that used to fall inside the removed item.
+            points = [list(item.position)]
+            for neighbour in spatial_index.query(item.position, dimension):
+                points.extend(get_extreme_points(neighbour))
+
+            for point in points:
+                candidate_points.add(
+                    point, spatial_index.query(point, [0, 0, 0])
+                )
+
+    def get_placement_evaluator(self):
+        from .vectorized import PlacementEvaluator
+
+        evaluator = self.placement_evaluator
+
+        if evaluator is None or len(evaluator) != len(self.items):
+            evaluator = PlacementEvaluator(self)
+
+            for current_item_in_bin in self.items:
+                evaluator.add(current_item_in_bin)
+
+            self.placement_evaluator = evaluator
+
+        return evaluator
+
+    def put_item_vectorized(self, item, pivots=None):
+        evaluator = self.get_placement_evaluator()
+
+        if pivots is None:
+            if self.items:
+                pivot_array = evaluator.get_pivots()
+            else:
+                pivots = [START_POSITION]
+
+        if pivots is not None:
+            pivot_array = evaluator.to_pivot_array(pivots)
+
+        start = perf_counter() if self.stats is not None else 0
+        weight_fits = (
+            self.get_total_weight() + item.weight <= self.max_weight
+        )
+        pivot_index, rotation_type = evaluator.find_placement(
+            item, pivot_array, weight_fits
+        )
+        item.rotation_type = rotation_type
+
+        if self.stats is not None:
+            self.stats.record_put_item(
+                evaluator.rotations_tested, evaluator.early_rejects,
+                evaluator.intersection_tests,
+                pivot_index is not None and not weight_fits,
+                pivot_index is not None and weight_fits, start,
+                pivots=evaluator.pivots_tested
+            )
+
+        if pivot_index is None:
+            return False
+
+        if pivots is not None:
+            pivot = pivots[pivot_index]
+        else:
+            axis, index = divmod(pivot_index, len(self.items))
+            ib = self.items[index]
+            pivot = list(ib.position)
+            pivot[axis] += ib.get_dimension()[axis]
+
+        # put_item leaves an overweight item at the last pivot it cleared.
+        item.position = pivot
+
+        if not weight_fits:
+            return False
+
+        self.items.append(item)
+        evaluator.add(item)
+
+        if self.spatial_index is not None:
+            self.spatial_index.insert(item)
+
+        return True
+
     def put_item(self, item, pivot):
         fit = False
         valid_item_position = item.position
         item.position = pivot
+        start = perf_counter() if self.stats is not None else 0
+        intersection_tests = 0
 
         for i in range(0, len(RotationType.ALL)):
             item.rotation_type = i
@@ -105,8 +438,10 @@ class Bin:
                 continue
 
             fit = True
+            spatial_index = self.get_spatial_index(dimension)
 
-            for current_item_in_bin in self.items:
+            for current_item_in_bin in spatial_index.query(pivot, dimension):
+                intersection_tests += 1
                 if intersect(current_item_in_bin, item):
                     fit = False
                     break
@@ -114,27 +449,46 @@ class Bin:
             if fit:
                 if self.get_total_weight() + item.weight > self.max_weight:
                     fit = False
+                    if self.stats is not None:
+                        self.stats.record_put_item(
+                            i + 1, i, intersection_tests, True, False, start
+                        )
                     return fit
 
                 self.items.append(item)
+                spatial_index.insert(item)
 
             if not fit:
                 item.position = valid_item_position
 
+            if self.stats is not None:
+                self.stats.record_put_item(
+                    i + 1, i, intersection_tests, False, fit, start
+                )
             return fit
 
         if not fit:
             item.position = valid_item_position
 
+        if self.stats is not None:
+            self.stats.record_put_item(
+                len(RotationType.ALL), len(RotationType.ALL), 0, False, False,
+                start
+            )
         return fit
 
 
 class Packer:
-    def __init__(self):
+    def __init__(self, cache=None, stats=None):
         self.bins = []
         self.items = []
         self.unfit_items = []
         self.total_items = 0
+        self.vectorized = False
+        self.pivot_strategy = PivotStrategy.ITEM_CORNERS
+        self.cache = cache
+        self.stats = stats
+        self.rejections = {}
 
     def add_bin(self, bin):
         return self.bins.append(bin)
@@ -145,15 +499,20 @@ class Packer:
         return self.items.append(item)
 
     def pack_to_bin(self, bin, item):
+        if not self.fit_to_bin(bin, item):
+            bin.unfitted_items.append(item)
+
+    def fit_to_bin(self, bin, item):
         fitted = False
 
-        if not bin.items:
-            response = bin.put_item(item, START_POSITION)
+        if self.pivot_strategy == PivotStrategy.EXTREME_POINTS:
+            return bin.put_item_at_candidate_point(item, self.vectorized)
 
-            if not response:
-                bin.unfitted_items.append(item)
+        if self.vectorized:
+            return bin.put_item_vectorized(item)
 
-            return
+        if not bin.items:
+            return bin.put_item(item, START_POSITION)
 
         for axis in range(0, 3):
             items_in_bin = bin.items
@@ -186,18 +545,34 @@ class Packer:
             if fitted:
                 break
 
-        if not fitted:
-            bin.unfitted_items.append(item)
+        return fitted
 
     def pack(
         self, bigger_first=False, distribute_items=False,
-        number_of_decimals=DEFAULT_NUMBER_OF_DECIMALS
+        number_of_decimals=DEFAULT_NUMBER_OF_DECIMALS, fixed_point=False,
+        vectorized=False, pivot_strategy=PivotStrategy.ITEM_CORNERS,
+        max_workers=None
     ):
+        if pivot_strategy not in PivotStrategy.ALL:
+            raise ValueError(
+                "Unknown pivot strategy: {}".format(pivot_strategy)
+            )
+
+        self.vectorized = vectorized
+        self.pivot_strategy = pivot_strategy
+        stats = self.stats
+        start = perf_counter()
+
         for bin in self.bins:
-            bin.format_numbers(number_of_decimals)
+            bin.format_numbers(number_of_decimals, fixed_point)
+            bin.stats = stats
 
         for item in self.items:
-            item.format_numbers(number_of_decimals)
+            item.format_numbers(number_of_decimals, fixed_point)
+
+        if stats is not None:
+            stats.record_phase('format_numbers', start)
+            start = perf_counter()
 
         self.bins.sort(
             key=lambda bin: bin.get_volume(), reverse=bigger_first
@@ -206,10 +581,91 @@ class Packer:
             key=lambda item: item.get_volume(), reverse=bigger_first
         )
 
+        if stats is not None:
+            stats.record_phase('sort', start)
+
+        cache_key = None
+
+        if self.cache is not None and not any(bin.items for bin in self.bins):
+            start = perf_counter()
+            cache_key = get_signature(
+                self, bigger_first=bigger_first,
+                distribute_items=distribute_items,
+                number_of_decimals=number_of_decimals, fixed_point=fixed_point,
+                pivot_strategy=pivot_strategy
+            )
+            result = self.cache.get(cache_key)
+
+            if result is not None:
+                apply_result(self, result)
+                if stats is not None:
+                    stats.record_phase('cache', start)
+                return
+
+            items = list(self.items)
+            start_positions = [list(item.position) for item in items]
+
+            if stats is not None:
+                stats.record_phase('cache', start)
+
+        start = perf_counter()
+
+        if (
+            max_workers and max_workers > 1 and not distribute_items and
+            len(self.bins) > 1 and not any(bin.items for bin in self.bins)
+        ):
+            from .batch import pack_bins_in_parallel
+
+            pack_bins_in_parallel(
+                self, max_workers, bigger_first=bigger_first,
+                number_of_decimals=number_of_decimals, fixed_point=fixed_point,
+                vectorized=vectorized, pivot_strategy=pivot_strategy
+            )
+        else:
+            self.pack_to_bins(distribute_items)
+
+        if stats is not None:
+            stats.record_phase('pack_to_bins', start)
+
+        if cache_key is not None:
+            self.cache.put(
+                cache_key, record_result(self, items, start_positions)
+            )
+
+    def pack_to_bins(self, distribute_items=False):
+        # When distributing, items placed in a bin are not offered to the
+        # next ones; RemainingItems drops them without list.remove's scan.
+        remaining = RemainingItems(self.items) if distribute_items else None
+
         for bin in self.bins:
-            for item in self.items:
+            items = list(remaining) if distribute_items else self.items
+
+            if self.pivot_strategy == PivotStrategy.EXTREME_POINTS:
+                remaining_min_dimensions = get_remaining_min_dimensions(items)
+
+            for index, item in enumerate(items):
+                if self.pivot_strategy == PivotStrategy.EXTREME_POINTS:
+                    bin.get_candidate_points().prune(
+                        remaining_min_dimensions[index]
+                    )
+
                 self.pack_to_bin(bin, item)
 
+                if self.stats is not None:
+                    self.stats.record_item(
+                        bin, item, bool(bin.items) and bin.items[-1] is item
+                    )
+
             if distribute_items:
                 for item in bin.items:
-                    self.items.remove(item)
+                    if item in remaining:
+                        remaining.remove(item)
+
+        if distribute_items:
+            self.items = list(remaining)
+
+    def export_arrays(self):
+        """Return every bin's placements as NumPy arrays, see export.py."""
+        from .export import export_arrays
+
+        return export_arrays(self.bins)
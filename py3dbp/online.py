@@ -0,0 +1,59 @@
+from .main import DEFAULT_NUMBER_OF_DECIMALS
+
+
+class OnlinePacker:
+    """Place items one at a time as they arrive, without repacking.
+
+    Bins keep their spatial index and candidate points between calls, so
+    each place() costs about one pack_to_bin step. Items go into the first
+    bin, in the order the bins were added, that has room for them.
+    """
+
+    def __init__(
+        self, bins=(), number_of_decimals=DEFAULT_NUMBER_OF_DECIMALS,
+        fixed_point=False, vectorized=False
+    ):
+        self.bins = []
+        self.unfit_items = []
+        self.number_of_decimals = number_of_decimals
+        self.fixed_point = fixed_point
+        self.vectorized = vectorized
+        self.item_bins = {}
+
+        for bin in bins:
+            self.add_bin(bin)
+
+    def add_bin(self, bin):
+        bin.format_numbers(self.number_of_decimals, self.fixed_point)
+
+        for item in bin.items:
+            item.format_numbers(self.number_of_decimals, self.fixed_point)
+            self.item_bins[id(item)] = bin
+
+        self.bins.append(bin)
+
+    def place(self, item):
+        item.format_numbers(self.number_of_decimals, self.fixed_point)
+
+        for bin in self.bins:
+            if bin.put_item_at_candidate_point(item, self.vectorized):
+                self.item_bins[id(item)] = bin
+                return bin
+
+        self.unfit_items.append(item)
+
+        return None
+
+    def extend(self, items):
+        return [self.place(item) for item in items]
+
+    def get_bin(self, item):
+        return self.item_bins.get(id(item))
+
+    def remove(self, item):
+        bin = self.item_bins.pop(id(item), None)
+
+        if bin is not None:
+            bin.remove_item(item)
+
+        return bin
@@ -0,0 +1,293 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from time import monotonic
+
+from .constants import RotationType, PivotStrategy
+from .main import Packer, Bin, Item, DEFAULT_NUMBER_OF_DECIMALS
+from .batch import get_bin_spec, get_item_spec
+
+RESTART_PROBABILITY = 0.05
+
+
+def evaluate(bin_specs, item_specs, candidate, pack_options):
+    """Pack item_specs in the candidate's order and base rotations.
+
+    A candidate is (order, rotations): order lists item spec indices and
+    rotations gives, per position, the RotationType the item's sides are
+    laid out in before packing. Since put_item tries rotations in a fixed
+    order, this decides which orientation is tried first. Returns the
+    packer; item names are the item spec indices.
+    """
+    order, rotations = candidate
+    packer = Packer()
+    packer.vectorized = pack_options['vectorized']
+    packer.pivot_strategy = pack_options['pivot_strategy']
+    number_of_decimals = pack_options['number_of_decimals']
+    fixed_point = pack_options['fixed_point']
+
+    for spec in bin_specs:
+        bin = Bin(*spec)
+        bin.format_numbers(number_of_decimals, fixed_point)
+        packer.add_bin(bin)
+
+    for index, rotation_type in zip(order, rotations):
+        _, width, height, depth, weight = item_specs[index]
+        item = Item(index, width, height, depth, weight)
+        item.rotation_type = rotation_type
+        width, height, depth = item.get_dimension()
+        item = Item(index, width, height, depth, weight)
+        item.format_numbers(number_of_decimals, fixed_point)
+        packer.add_item(item)
+
+    packer.pack_to_bins(pack_options['distribute_items'])
+
+    return packer
+
+
+def get_score(packer):
+    # More packed volume first, then less volume in the bins that were used.
+    fitted_volume = 0
+    used_volume = 0
+
+    for bin in packer.bins:
+        if bin.items:
+            used_volume += bin.width * bin.height * bin.depth
+        for item in bin.items:
+            fitted_volume += item.width * item.height * item.depth
+
+    return fitted_volume, -used_volume
+
+
+def mutate(rng, candidate):
+    order, rotations = list(candidate[0]), list(candidate[1])
+    size = len(order)
+
+    if rng.random() < RESTART_PROBABILITY:
+        positions = list(range(size))
+        rng.shuffle(positions)
+        return (
+            tuple(order[position] for position in positions),
+            tuple(rng.choice(RotationType.ALL) for _ in range(size))
+        )
+
+    move = rng.randrange(3)
+    i = rng.randrange(size)
+
+    if move == 0:
+        j = rng.randrange(size)
+        order[i], order[j] = order[j], order[i]
+        rotations[i], rotations[j] = rotations[j], rotations[i]
+    elif move == 1:
+        j = rng.randrange(size)
+        order.insert(j, order.pop(i))
+        rotations.insert(j, rotations.pop(i))
+    else:
+        rotations[i] = rng.choice(RotationType.ALL)
+
+    return tuple(order), tuple(rotations)
+
+
+def search_worker(
+    bin_specs, item_specs, candidate, score, seed, iterations, pack_options,
+    time_left=None
+):
+    # Returns (best_score, best, finished); finished is False when time_left
+    # seconds ran out before all iterations. The deadline is taken from this
+    # process's monotonic clock, so it does not jump with the system clock.
+    rng = random.Random(seed)
+    best, best_score = candidate, score
+    current = candidate
+    deadline = None if time_left is None else monotonic() + time_left
+
+    for _ in range(iterations):
+        if deadline is not None and monotonic() > deadline:
+            return best_score, best, False
+
+        current = mutate(rng, current)
+        current_score = get_score(
+            evaluate(bin_specs, item_specs, current, pack_options)
+        )
+
+        if current_score > best_score:
+            best, best_score = current, current_score
+        else:
+            current = best
+
+    return best_score, best, True
+
+
+class AnytimeSearch:
+    """Improve on Packer.pack's greedy result within a time budget.
+
+    Every round, each of max_workers workers runs iterations steps of local
+    search from the best candidate so far, with random restarts, and the
+    best result wins, earlier workers first on ties. When the time budget
+    runs out mid-round, the workers still return the best they found so
+    far and the search stops after that round. Worker seeds come from seed,
+    the round and the worker number, so with max_rounds and no time budget
+    the outcome only depends on seed, max_workers and iterations. best
+    always holds the best packing found so far and apply() writes it to the
+    packer.
+    """
+
+    def __init__(
+        self, packer, max_workers=1, seed=0, iterations=50,
+        bigger_first=False, distribute_items=False,
+        number_of_decimals=DEFAULT_NUMBER_OF_DECIMALS, fixed_point=False,
+        vectorized=False, pivot_strategy=PivotStrategy.ITEM_CORNERS
+    ):
+        if pivot_strategy not in PivotStrategy.ALL:
+            raise ValueError(
+                "Unknown pivot strategy: {}".format(pivot_strategy)
+            )
+
+        self.packer = packer
+        self.max_workers = max_workers
+        self.seed = seed
+        self.iterations = iterations
+        self.pack_options = {
+            'distribute_items': distribute_items,
+            'number_of_decimals': number_of_decimals,
+            'fixed_point': fixed_point,
+            'vectorized': vectorized,
+            'pivot_strategy': pivot_strategy,
+        }
+        self.rounds = 0
+
+        for bin in packer.bins:
+            bin.format_numbers(number_of_decimals, fixed_point)
+
+        for item in packer.items:
+            item.format_numbers(number_of_decimals, fixed_point)
+
+        packer.bins.sort(
+            key=lambda bin: bin.get_volume(), reverse=bigger_first
+        )
+        packer.items.sort(
+            key=lambda item: item.get_volume(), reverse=bigger_first
+        )
+
+        self.bins = list(packer.bins)
+        self.items = list(packer.items)
+        self.bin_specs = [get_bin_spec(bin) for bin in self.bins]
+        self.item_specs = [get_item_spec(item) for item in self.items]
+        self.best = (
+            tuple(range(len(self.items))),
+            tuple(RotationType.RT_WHD for _ in self.items)
+        )
+        self.best_score = get_score(evaluate(
+            self.bin_specs, self.item_specs, self.best, self.pack_options
+        ))
+
+    def iter_improvements(self, time_budget=None, max_rounds=None):
+        """Run rounds, yielding (round, score, candidate) on improvement."""
+        if time_budget is None and max_rounds is None:
+            raise ValueError("Give a time_budget, max_rounds or both")
+
+        if not self.items:
+            return
+
+        deadline = None if time_budget is None else monotonic() + time_budget
+        executor = None
+        rounds = 0
+
+        if self.max_workers > 1:
+            executor = ProcessPoolExecutor(self.max_workers)
+
+        try:
+            while max_rounds is None or rounds < max_rounds:
+                time_left = None
+                if deadline is not None:
+                    time_left = deadline - monotonic()
+                    if time_left <= 0:
+                        break
+
+                arguments = [
+                    (
+                        self.bin_specs, self.item_specs, self.best,
+                        self.best_score,
+                        "{}-{}-{}".format(self.seed, self.rounds, worker),
+                        self.iterations, self.pack_options, time_left
+                    )
+                    for worker in range(self.max_workers)
+                ]
+
+                if executor is None:
+                    results = [search_worker(*args) for args in arguments]
+                else:
+                    results = list(
+                        executor.map(search_worker, *zip(*arguments))
+                    )
+
+                rounds += 1
+                self.rounds += 1
+                improved = False
+
+                for score, candidate, _ in results:
+                    if score > self.best_score:
+                        self.best, self.best_score = candidate, score
+                        improved = True
+
+                if improved:
+                    yield self.rounds, self.best_score, self.best
+
+                if not all(finished for _, _, finished in results):
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def run(self, time_budget=None, max_rounds=None):
+        for _ in self.iter_improvements(time_budget, max_rounds):
+            pass
+
+        return self.best_score
+
+    def apply(self):
+        result = evaluate(
+            self.bin_specs, self.item_specs, self.best, self.pack_options
+        )
+
+        for bin, result_bin in zip(self.bins, result.bins):
+            bin.items = [
+                self.place(result_item) for result_item in result_bin.items
+            ]
+            bin.unfitted_items = [
+                self.items[result_item.name]
+                for result_item in result_bin.unfitted_items
+            ]
+
+        placed = {id(item) for bin in self.bins for item in bin.items}
+        self.packer.bins = list(self.bins)
+
+        if self.pack_options['distribute_items']:
+            self.packer.items = [
+                item for item in self.items if id(item) not in placed
+            ]
+        else:
+            self.packer.items = list(self.items)
+
+    def place(self, result_item):
+        # Find the rotation of the caller's item with the sides the result
+        # ended up with.
+        item = self.items[result_item.name]
+        dimension = result_item.get_dimension()
+
+        for rotation_type in RotationType.ALL:
+            item.rotation_type = rotation_type
+            if item.get_dimension() == dimension:
+                break
+
+        item.position = list(result_item.position)
+
+        return item
+
+
+def improve(packer, time_budget, max_workers=1, seed=0, **options):
+    """Run an AnytimeSearch for time_budget seconds and apply the best."""
+    max_rounds = options.pop('max_rounds', None)
+    search = AnytimeSearch(packer, max_workers, seed, **options)
+    search.run(time_budget, max_rounds)
+    search.apply()
+
+    return search
@@ -0,0 +1,92 @@
+from .main import Packer, DEFAULT_NUMBER_OF_DECIMALS
+
+
+def get_rejection(bin, items):
+    """Return why items certainly cannot all fit in bin, or None.
+
+    These are necessary conditions only: a bin that passes may still fail
+    to hold everything once actually packed.
+    """
+    if sum(item.weight for item in items) > bin.max_weight:
+        return 'weight'
+
+    # Exact products rather than the quantized get_volume(), so rounding can
+    # never rule out a bin that is filled exactly.
+    if (
+        sum(item.width * item.height * item.depth for item in items) >
+        bin.width * bin.height * bin.depth
+    ):
+        return 'volume'
+
+    # Every rotation is a permutation of the sides, so an item fits some way
+    # round only if its sorted sides fit the bin's sorted sides.
+    bin_sides = sorted([bin.width, bin.height, bin.depth])
+
+    for item in items:
+        item_sides = sorted([item.width, item.height, item.depth])
+        if any(
+            item_side > bin_side
+            for item_side, bin_side in zip(item_sides, bin_sides)
+        ):
+            return 'dimension'
+
+    return None
+
+
+def select_bin(
+    packer, key=None, number_of_decimals=DEFAULT_NUMBER_OF_DECIMALS,
+    fixed_point=False, **pack_options
+):
+    """Pack all of packer's items into the cheapest single bin that holds them.
+
+    Bins are tried in ascending key(bin) order, by volume unless a key such
+    as lambda bin: prices[bin.name] is given. Bins ruled out by
+    get_rejection are never packed, and the search stops at the first bin
+    that takes every item. That bin is returned holding the items, and the
+    other bins are left empty. Returns None when no bin can hold the order.
+    packer.rejections maps each bin name that was ruled out to 'weight',
+    'volume', 'dimension' or 'packing'. pack_options are passed on to
+    Packer.pack.
+    """
+    for bin in packer.bins:
+        bin.format_numbers(number_of_decimals, fixed_point)
+
+    for item in packer.items:
+        item.format_numbers(number_of_decimals, fixed_point)
+
+    if key is None:
+        key = get_bin_volume
+
+    pack_options.pop('distribute_items', None)
+    packer.rejections = {}
+
+    for bin in sorted(packer.bins, key=key):
+        rejection = get_rejection(bin, packer.items)
+
+        if rejection is not None:
+            packer.rejections[bin.name] = rejection
+            continue
+
+        trial = Packer(cache=packer.cache, stats=packer.stats)
+        trial.add_bin(bin)
+
+        for item in packer.items:
+            trial.add_item(item)
+
+        trial.pack(
+            number_of_decimals=number_of_decimals, fixed_point=fixed_point,
+            **pack_options
+        )
+
+        if len(bin.items) == len(packer.items):
+            return bin
+
+        packer.rejections[bin.name] = 'packing'
+        bin.items = []
+        bin.unfitted_items = []
+
+    return None
+
+
+def get_bin_volume(bin):
+    return bin.get_volume()
@@ -0,0 +1,73 @@
+from .constants import Axis
+
+
+class SpatialGrid:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.item_cells = {}
+        self.items = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def get_cell_range(self, position, dimension):
+        return [
+            (
+                int(position[axis] // self.cell_size[axis]),
+                int((position[axis] + dimension[axis]) // self.cell_size[axis])
+            )
+            for axis in Axis.ALL
+        ]
+
+    def get_cells(self, cell_range):
+        (x0, x1), (y0, y1), (z0, z1) = cell_range
+
+        return [
+            (x, y, z)
+            for x in range(x0, x1 + 1)
+            for y in range(y0, y1 + 1)
+            for z in range(z0, z1 + 1)
+        ]
+
+    def insert(self, item):
+        key = id(item)
+        cells = self.get_cells(
+            self.get_cell_range(item.position, item.get_dimension())
+        )
+
+        for cell in cells:
+            self.cells.setdefault(cell, {})[key] = item
+
+        self.item_cells[key] = cells
+        self.items[key] = item
+
+    def remove(self, item):
+        key = id(item)
+
+        for cell in self.item_cells.pop(key, []):
+            bucket = self.cells[cell]
+            del bucket[key]
+            if not bucket:
+                del self.cells[cell]
+
+        self.items.pop(key, None)
+
+    def query(self, position, dimension):
+        cell_range = self.get_cell_range(position, dimension)
+        number_of_cells = 1
+        for low, high in cell_range:
+            number_of_cells *= high - low + 1
+
+        # A candidate box spanning more cells than there are placed items is
+        # cheaper to check against every item directly.
+        if number_of_cells >= len(self.items):
+            return self.items.values()
+
+        found = {}
+        for cell in self.get_cells(cell_range):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+
+        return found.values()
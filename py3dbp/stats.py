@@ -0,0 +1,92 @@
+from time import perf_counter
+from weakref import WeakKeyDictionary
+
+
+class Counters:
+    __slots__ = (
+        'pivots', 'rotations', 'early_rejects', 'intersection_tests',
+        'weight_rejects', 'placements', 'seconds'
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def add(self, other):
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class PackingStats:
+    """Counters and phase timings for Packer.pack.
+
+    Attach one with Packer(stats=PackingStats()). Bins, items and the
+    totals each get a Counters: pivots tried, rotations tried, early rejects
+    (rotations that leave the bin), intersection tests, weight rejects,
+    placements and seconds spent placing. bins and items are keyed by the
+    Bin and Item objects, so ones that share a name are counted apart, and
+    as_dict lists them in the order they were first packed. They are weak
+    keys: a bin's or item's counters go away with it, so a long-lived stats
+    object neither keeps packed items alive nor grows without bound; read
+    them (or as_dict) while the objects are still around. callback, if
+    given, is called as callback(bin, item, fitted, counters) once
+    pack_to_bin finishes with an item, where counters only cover that step.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        self.totals = Counters()
+        self.bins = WeakKeyDictionary()
+        self.items = WeakKeyDictionary()
+        self.phases = {}
+        self.step = Counters()
+
+    def record_phase(self, name, start):
+        self.phases[name] = self.phases.get(name, 0) + perf_counter() - start
+
+    def record_put_item(
+        self, rotations, early_rejects, intersection_tests, weight_rejected,
+        fitted, start, pivots=1
+    ):
+        step = self.step
+        step.pivots += pivots
+        step.rotations += rotations
+        step.early_rejects += early_rejects
+        step.intersection_tests += intersection_tests
+        step.weight_rejects += weight_rejected
+        step.placements += fitted
+        step.seconds += perf_counter() - start
+
+    def record_item(self, bin, item, fitted):
+        step = self.step
+        self.step = Counters()
+
+        for counters in (
+            self.totals,
+            self.bins.setdefault(bin, Counters()),
+            self.items.setdefault(item, Counters()),
+        ):
+            counters.add(step)
+
+        if self.callback is not None:
+            self.callback(bin, item, fitted, step)
+
+    def as_dict(self):
+        return {
+            'totals': self.totals.as_dict(),
+            'bins': [
+                dict(name=bin.name, **counters.as_dict())
+                for bin, counters in self.bins.items()
+            ],
+            'items': [
+                dict(name=item.name, **counters.as_dict())
+                for item, counters in self.items.items()
+            ],
+            'phases': dict(self.phases),
+        }
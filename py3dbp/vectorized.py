@@ -0,0 +1,155 @@
+import numpy as np
+
+from .constants import RotationType, Axis
+from .auxiliary_methods import set_to_fixed_point
+
+# Axis of the unrotated (width, height, depth) that lands on each bin axis,
+# row for row in RotationType order; mirrors Item.get_dimension.
+ROTATION_AXES = np.array([
+    [0, 1, 2],
+    [1, 0, 2],
+    [1, 2, 0],
+    [2, 1, 0],
+    [2, 0, 1],
+    [0, 2, 1],
+])
+# Upper bound on pivots x placed items compared in one batch.
+CHUNK_SIZE = 1 << 20
+FIRST_CHUNK_SIZE = 32
+
+
+class PlacementEvaluator:
+    def __init__(self, bin):
+        self.number_of_decimals = bin.number_of_decimals
+        self.fixed_point = bin.fixed_point
+        self.bin_dimension = self.to_array(
+            [bin.width, bin.height, bin.depth]
+        )
+        self.min_corners = np.empty((16, 3), dtype=np.int64)
+        self.max_corners = np.empty((16, 3), dtype=np.int64)
+        self.size = 0
+        # Work done by the last find_placement call, for PackingStats.
+        self.pivots_tested = 0
+        self.rotations_tested = 0
+        self.early_rejects = 0
+        self.intersection_tests = 0
+
+    def __len__(self):
+        return self.size
+
+    def to_array(self, values):
+        if self.fixed_point:
+            return np.array([int(value) for value in values], dtype=np.int64)
+
+        return np.array([
+            set_to_fixed_point(value, self.number_of_decimals)
+            for value in values
+        ], dtype=np.int64)
+
+    def to_pivot_array(self, pivots):
+        return np.array(
+            [self.to_array(pivot) for pivot in pivots], dtype=np.int64
+        ).reshape(-1, 3)
+
+    def add(self, item):
+        if self.size == len(self.min_corners):
+            self.min_corners = np.concatenate(
+                [self.min_corners, np.empty_like(self.min_corners)]
+            )
+            self.max_corners = np.concatenate(
+                [self.max_corners, np.empty_like(self.max_corners)]
+            )
+
+        position = self.to_array(item.position)
+        self.min_corners[self.size] = position
+        self.max_corners[self.size] = position + self.to_array(
+            item.get_dimension()
+        )
+        self.size += 1
+
+    def remove(self, index):
+        self.min_corners[index:self.size - 1] = (
+            self.min_corners[index + 1:self.size]
+        )
+        self.max_corners[index:self.size - 1] = (
+            self.max_corners[index + 1:self.size]
+        )
+        self.size -= 1
+
+    def get_pivots(self):
+        min_corners = self.min_corners[:self.size]
+        max_corners = self.max_corners[:self.size]
+        pivots = np.repeat(min_corners[None], len(Axis.ALL), axis=0)
+
+        for axis in Axis.ALL:
+            pivots[axis, :, axis] = max_corners[:, axis]
+
+        return pivots.reshape(-1, 3)
+
+    def find_placement(self, item, pivots, weight_fits=True):
+        """Return (pivot index or None, rotation type) for item.
+
+        Each pivot only gets its first rotation that stays inside the bin, as
+        in Bin.put_item, and the rotation returned with a miss is the one the
+        last put_item call would have left on the item. When the weight does
+        not fit, the index is that of the last collision-free pivot, which is
+        where put_item leaves the item's position.
+        """
+        dimension = self.to_array([item.width, item.height, item.depth])
+        rotated = dimension[ROTATION_AXES]
+        min_corners = self.min_corners[:self.size]
+        max_corners = self.max_corners[:self.size]
+        last_rotation = RotationType.ALL[-1]
+        last_feasible = None
+        max_chunk = max(1, CHUNK_SIZE // max(1, self.size))
+        chunk = min(FIRST_CHUNK_SIZE, max_chunk) if weight_fits else max_chunk
+        start = 0
+        self.pivots_tested = 0
+        self.rotations_tested = 0
+        self.early_rejects = 0
+        self.intersection_tests = 0
+
+        # Chunks grow geometrically: early pivots usually succeed, so most
+        # items never pay for comparing every pivot against every item.
+        while start < len(pivots):
+            block = pivots[start:start + chunk]
+            ends = block[:, None, :] + rotated[None, :, :]
+            in_bin = (ends <= self.bin_dimension).all(axis=2)
+            has_rotation = in_bin.any(axis=1)
+            rotation = np.where(
+                has_rotation, in_bin.argmax(axis=1), RotationType.ALL[-1]
+            )
+            last_rotation = int(rotation[-1])
+            candidates = np.flatnonzero(has_rotation)
+            self.pivots_tested += len(block)
+            self.rotations_tested += len(block) * len(RotationType.ALL)
+            self.early_rejects += int(np.count_nonzero(~in_bin))
+            self.intersection_tests += len(candidates) * self.size
+
+            if len(candidates):
+                lows = block[candidates]
+                highs = ends[candidates, rotation[candidates]]
+
+                for axis in Axis.ALL:
+                    overlaps = (
+                        (lows[:, None, axis] < max_corners[None, :, axis]) &
+                        (min_corners[None, :, axis] < highs[:, None, axis])
+                    )
+                    if axis == Axis.WIDTH:
+                        overlap = overlaps
+                    else:
+                        overlap &= overlaps
+
+                feasible = candidates[~overlap.any(axis=1)]
+
+                if len(feasible) and weight_fits:
+                    index = int(feasible[0])
+                    return start + index, int(rotation[index])
+
+                if len(feasible):
+                    last_feasible = start + int(feasible[-1])
+
+            start += len(block)
+            chunk = min(chunk * 2, max_chunk)
+
+        return last_feasible, last_rotation
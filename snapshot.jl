@@ -0,0 +1,43 @@
+# Formato binario de los snapshots de webapi.jl. Little-endian: encabezado de
+# 24 bytes (magic, versión, banderas, número de robots, cajas y almacenes,
+# longitud de Location), Location y luego, por tipo de agente, arreglos de
+# ancho fijo alineados a 8 bytes (ver Snapshot.py). No usa Genie, así que
+# test_snapshot.py lo puede cargar solo.
+const SNAPSHOT_MAGIC = b"AMZS"
+const SNAPSHOT_VERSION = UInt16(1)
+
+function pad8!(io)
+    while position(io) % 8 != 0
+        write(io, UInt8(0))
+    end
+end
+
+function write_column!(io, values)
+    write(io, htol.(values))
+    pad8!(io)
+end
+
+function encode_snapshot(robots, boxes, storages; location="")
+    io = IOBuffer()
+    loc = Vector{UInt8}(location)
+    write(io, SNAPSHOT_MAGIC, htol(SNAPSHOT_VERSION), htol(UInt16(0)),
+        htol(UInt32(length(robots))), htol(UInt32(length(boxes))),
+        htol(UInt32(length(storages))), htol(UInt32(length(loc))))
+    write(io, loc)
+    pad8!(io)
+
+    write_column!(io, Int64[a.id for a in robots])
+    write_column!(io, Int32[c for a in robots for c in a.pos])
+    write_column!(io, Int8[round(Int8, a.orientation) for a in robots])
+    write_column!(io, Int8[a.dx for a in robots])
+    write_column!(io, Int8[a.dy for a in robots])
+    write_column!(io, Int32[a.counter for a in robots])
+
+    write_column!(io, Int64[a.id for a in boxes])
+    write_column!(io, Int32[c for a in boxes for c in a.pos])
+    write_column!(io, Int8[Int(a.status) for a in boxes])
+
+    write_column!(io, Int64[a.id for a in storages])
+    write_column!(io, Int32[c for a in storages for c in a.pos])
+    return take!(io)
+end
@@ -30,17 +30,34 @@ packer.add_item(Item("250g [powder 9]", 7.8740, 3.9370, 1.9685))
 
 packer.pack()
 
-for b in packer[:bins]
-    println("::::::::::: ", b[:string]())
+# Todo el resultado en pocas llamadas (un arreglo NumPy por columna) en vez de
+# una llamada a Python por atributo de cada item. pycall(..., PyObject) evita
+# que PyCall convierta el dict a un Dict de Julia.
+placements = pycall(packer.export_arrays, PyObject)
+column(name) = get(placements, PyArray, name)
+bin_index = column("bin_index")
+item_index = column("item_index")
+positions = column("position")
+rotation_types = column("rotation_type")
+dimensions = column("dimension")
+unfitted_bin_index = column("unfitted_bin_index")
+unfitted_item_index = column("unfitted_item_index")
+bin_names = placements["bin_names"]
+item_names = placements["names"]
+
+for (b, bin_name) in enumerate(bin_names)
+    println("::::::::::: ", bin_name)
 
     println("FITTED ITEMS:")
-    for item in b[:items]
-        println("====> ", item[:string]())
+    for i in findall(==(b - 1), bin_index)
+        println("====> ", item_names[item_index[i] + 1],
+            " pos(", positions[i, :], ") rt(", rotation_types[i],
+            ") dim(", dimensions[i, :], ")")
     end
 
     println("UNFITTED ITEMS:")
-    for item in b[:unfitted_items]
-        println("====> ", item[:string]())
+    for i in findall(==(b - 1), unfitted_bin_index)
+        println("====> ", item_names[unfitted_item_index[i] + 1])
     end
 
     println("***************************************************")
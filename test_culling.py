@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+# El cliente necesita pygame, PyOpenGL y requests aunque estas pruebas no abran ventana
+pytest.importorskip("pygame")
+pytest.importorskip("OpenGL")
+pytest.importorskip("requests")
+
+import main
+from Robot import Robot
+from SimClock import SimClock
+
+def robots(xs, y=10):
+    return [
+        {"id": i, "pos": [x, y], "orientation": 0, "dx": 0, "dy": 0, "counter": 0}
+        for i, x in enumerate(xs)
+    ]
+
+@pytest.fixture
+def client():
+    main.viewport.zoom = 1.0
+    main.renderer.instances = {}
+    main.raster.clear()
+    yield main
+    main.viewport.zoom = 1.0
+    main.renderer.instances = {}
+    main.raster.clear()
+
+def queued_robots(client):
+    shape, batches = client.renderer.instances.get("robot", (None, []))
+    return np.concatenate([batch[0] for batch in batches]) if batches else np.zeros((0, 2))
+
+def load(client, xs):
+    client.load_snapshot({"robots": robots(xs), "boxes": [], "storages": []})
+
+def test_drawn_offset_uses_the_shape_weight(client):
+    pos = np.array([[10.0, 10.0], [70.0, 10.0]])
+    assert Robot.SHAPE.weight == 0.5
+    assert client.drawn_offsets(Robot.SHAPE, pos, client.ROBOT_SCALE).tolist() == [[100, 100], [700, 100]]
+
+def test_robots_in_view_are_never_culled(client):
+    xs = list(range(10, 80, 12))
+    load(client, xs)
+    # Los de x=58 y 70 se dibujan en 580 y 700 pero se hasheaban en 1160 y 1400
+    drawn = client.drawn_offsets(Robot.SHAPE, [[x, 10] for x in xs], client.ROBOT_SCALE)
+    assert client.in_view(drawn, 0).all()
+
+    client.queue_dynamic()
+    assert len(queued_robots(client)) == len(xs)
+    # Se encolan en pos*ROBOT_SCALE; la figura los lleva a pos*ROBOT_SCALE*0.5
+    assert np.array_equal(queued_robots(client) * Robot.SHAPE.weight, drawn)
+
+def test_interpolated_robots_in_view_are_never_culled(client):
+    xs = list(range(10, 80, 12))
+    load(client, xs)
+    clock = SimClock(1.0, clock=lambda: 0.0)
+    clock.push({"robots": robots(xs), "boxes": [], "storages": []})
+    clock.advance()
+
+    client.queue_dynamic(clock.robotPoses(0.5))
+    assert len(queued_robots(client)) == len(xs)
+
+def test_robots_out_of_view_are_culled(client):
+    # x=200 se dibuja en 2000, fuera de la vista inicial
+    load(client, [10, 200])
+
+    client.queue_dynamic()
+    assert queued_robots(client).tolist() == [[200, 200]]
+
+def test_lod_points_are_drawn_where_the_robot_is(client):
+    xs = [10, 40, 70]
+    load(client, xs)
+    client.viewport.zoom = client.viewport.baseWidth / client.LOD_WIDTH / 2
+    assert client.viewport.isLod()
+
+    client.queue_dynamic()
+    points = client.raster.parts[0][0]
+    assert points.tolist() == [[x * 10, 100] for x in xs]
@@ -0,0 +1,43 @@
+import random
+
+import numpy as np
+import pytest
+
+from EntityStore import EntityStore
+
+def reference_rows(rows, ids):
+    """Asignación de filas original: un dict de id a fila, en orden de aparición."""
+    result = []
+    for agentId in ids:
+        result.append(rows.setdefault(int(agentId), len(rows)))
+    return result
+
+def test_rows_match_reference():
+    rng = random.Random(0)
+    store = EntityStore(capacity=4)
+    expected = {}
+    for _ in range(200):
+        ids = [rng.randrange(60) for _ in range(rng.randrange(0, 40))]
+        if rng.random() < 0.3:
+            # A veces llegan los mismos ids que la vez anterior
+            ids = store.lastIds.tolist() if store.lastIds is not None else ids
+        assert store.rowsForIds(ids).tolist() == reference_rows(expected, ids)
+    assert len(store) == len(expected)
+    assert store.ids[:len(store)].tolist() == sorted(expected, key=expected.get)
+
+def test_same_ids_reuse_rows():
+    store = EntityStore()
+    first = store.rowsForIds([7, 3, 9])
+
+    assert store.rowsForIds(np.array([7, 3, 9])) is first
+    assert store.rowsForIds([3, 7, 9]).tolist() == [1, 0, 2]
+    with pytest.raises(ValueError):
+        first[0] = 5
+
+def test_load_grows_capacity():
+    store = EntityStore(capacity=2)
+    rows = store.load([{"id": i, "pos": [i, -i]} for i in range(5)])
+
+    assert rows.tolist() == [0, 1, 2, 3, 4]
+    assert store.capacity >= 5
+    assert store.pos[rows].tolist() == [[i, -i] for i in range(5)]
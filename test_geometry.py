@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+# Geometry y Raster importan PyOpenGL, aunque aquí no se dibuja nada
+pytest.importorskip("OpenGL")
+
+from Box import Box
+from OpMat import OpMat
+from Raster import POINT_SIZE, bresenham_points
+from Robot import Robot
+
+def gpu_points(shape, x, y, theta, scale, world):
+    """Lo que calcula VERTEX_SHADER para una instancia, en float32 como la GPU."""
+    vertices = shape.edgeVertices(shape.samplesFor(scale * np.abs(world[:2, :2]).sum(axis=0).max()))
+    c, s = np.float32(np.cos(np.radians(theta))), np.float32(np.sin(np.radians(theta)))
+    local = np.float32(scale) * vertices[:, :2]
+    rotated = np.stack([c * local[:, 0] - s * local[:, 1], s * local[:, 0] + c * local[:, 1]], axis=1)
+    weight = vertices[:, 2:]
+    p = np.concatenate([rotated + weight * np.float32([x, y]), weight], axis=1) @ world.astype(np.float32).T
+    return np.floor(p[:, :2] + np.float32(0.5))
+
+def cpu_points(opera, shape, x, y, theta, scale):
+    points = opera.transformObjects(shape.points, [x], [y], [theta], [scale], [scale])[0]
+    return bresenham_points(points[shape.edges[:, 0]], points[shape.edges[:, 1]])[0]
+
+def within_one(a, b):
+    """Si cada pixel entero de a tiene un pixel de b a lo más a una unidad por eje."""
+    key = lambda points: points[:, 0].astype(np.int64) * 100000 + points[:, 1].astype(np.int64)
+    keys = key(b)
+    near = np.zeros(len(a), dtype=bool)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            near |= np.isin(key(a + [dx, dy]), keys)
+    return near.all()
+
+@pytest.mark.parametrize("shape", [Robot.SHAPE, Box.SHAPE], ids=["robot", "box"])
+def test_gpu_points_stay_within_one_unit_of_bresenham(shape):
+    opera = OpMat()
+    opera.loadId()
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        x, y = rng.uniform(0, 1600, 2)
+        theta = rng.uniform(0, 360)
+        scale = rng.choice([0.5, 3.0, 5.0])
+        gpu = gpu_points(shape, x, y, theta, scale, opera.currentMatrix)
+        cpu = np.round(cpu_points(opera, shape, x, y, theta, scale))
+        # Los pixeles no son los mismos (DDA contra Bresenham), pero caen dentro del punto
+        assert within_one(gpu, cpu) and within_one(cpu, gpu)
+    assert 1 < POINT_SIZE / 2
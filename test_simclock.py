@@ -0,0 +1,54 @@
+import numpy as np
+
+import Snapshot
+from SimClock import SimClock
+
+def snapshot(positions, orientations):
+    return {
+        "robots": [
+            {"id": i, "pos": list(pos), "orientation": orientation, "dx": 0, "dy": 0, "counter": 0}
+            for i, (pos, orientation) in enumerate(zip(positions, orientations))
+        ],
+        "boxes": [],
+        "storages": [],
+    }
+
+def clock_with(*snapshots):
+    clock = SimClock(1.0, clock=lambda: 0.0)
+    for snap in snapshots:
+        clock.push(snap)
+    clock.advance(0.0)
+    return clock
+
+def test_interpolates_between_the_last_two():
+    clock = clock_with(snapshot([(0, 0), (5, 5)], [0, 3]), snapshot([(2, 0), (5, 6)], [1, 0]))
+    assert clock.advance(1.0)
+
+    pos, theta = clock.robotPoses(1.5)
+    assert pos.tolist() == [[1, 0], [5, 5.5]]
+    # 0 -> 1 gira de 90 a 180; 3 -> 0 va de 0 a 90 por el camino corto
+    assert theta.tolist() == [135, 45]
+
+def test_poses_are_cached_on_push():
+    first = snapshot([(0, 0)], [0])
+    clock = clock_with(first)
+    # Cambiar el snapshot después de push no cambia las poses
+    first["robots"][0]["pos"] = [9, 9]
+
+    pos, theta = clock.robotPoses(0.0)
+    assert pos.tolist() == [[0, 0]] and theta.tolist() == [90]
+    assert clock.current is first
+
+def test_columns_and_lists_give_the_same_poses():
+    snap = snapshot([(1, 2), (3, 4)], [2, 3])
+    columns = Snapshot.decode(Snapshot.encode(snap))
+
+    for a, b in zip(clock_with(snap).robotPoses(0.0), clock_with(columns).robotPoses(0.0)):
+        assert np.array_equal(a, b)
+
+def test_new_robot_count_does_not_interpolate():
+    clock = clock_with(snapshot([(0, 0)], [0]), snapshot([(4, 4), (1, 1)], [0, 0]))
+    clock.advance(1.0)
+
+    pos, _ = clock.robotPoses(1.5)
+    assert pos.tolist() == [[4, 4], [1, 1]]
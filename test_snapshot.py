@@ -0,0 +1,118 @@
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+import Snapshot
+from EntityStore import EntityStore, STATUS_TAKEN, STATUS_UNKNOWN
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SNAPSHOT = {
+    "robots": [
+        {"id": 11, "pos": [1, 2], "orientation": 3, "dx": -1, "dy": 0, "counter": 7},
+        {"id": 4, "pos": [79, 0], "orientation": 0, "dx": 0, "dy": 1, "counter": 0},
+    ],
+    "boxes": [
+        {"id": 20, "pos": [5, 6], "status": "taken"},
+        {"id": 21, "pos": [7, 8], "status": "lost"},
+    ],
+    "storages": [{"id": 30, "pos": [0, 79]}],
+}
+
+def test_round_trip():
+    buffer = Snapshot.encode(SNAPSHOT, location="/simulations/abc")
+    snapshot = Snapshot.decode(buffer)
+
+    assert snapshot["Location"] == "/simulations/abc"
+    robots = snapshot["robots"]
+    assert robots["ids"].tolist() == [11, 4]
+    assert robots["pos"].tolist() == [[1, 2], [79, 0]]
+    assert robots["orientation"].tolist() == [3, 0]
+    assert robots["dx"].tolist() == [-1, 0]
+    assert robots["dy"].tolist() == [0, 1]
+    assert robots["counter"].tolist() == [7, 0]
+    assert snapshot["boxes"]["ids"].tolist() == [20, 21]
+    assert snapshot["boxes"]["status"].tolist() == [STATUS_TAKEN, STATUS_UNKNOWN]
+    assert snapshot["storages"]["pos"].tolist() == [[0, 79]]
+    # Lo decodificado se vuelve a codificar igual
+    assert Snapshot.encode(snapshot, location=snapshot["Location"]) == buffer
+
+def test_columns_are_aligned_views():
+    buffer = Snapshot.encode(SNAPSHOT)
+    snapshot = Snapshot.decode(buffer)
+
+    assert "Location" not in snapshot
+    assert len(buffer) % Snapshot.ALIGN == 0
+    for kind in Snapshot.KINDS:
+        for column in snapshot[kind].values():
+            assert not column.flags.writeable
+
+def test_empty_kinds():
+    snapshot = Snapshot.decode(Snapshot.encode({"robots": [], "boxes": [], "storages": []}))
+
+    for kind in Snapshot.KINDS:
+        assert snapshot[kind]["ids"].shape == (0,)
+        assert snapshot[kind]["pos"].shape == (0, 2)
+
+@pytest.mark.parametrize("size", [0, Snapshot.HEADER.itemsize - 1])
+def test_short_header(size):
+    buffer = Snapshot.encode(SNAPSHOT)
+
+    with pytest.raises(ValueError, match="too short"):
+        Snapshot.decode(buffer[:size])
+
+def test_truncated_columns():
+    buffer = Snapshot.encode(SNAPSHOT, location="/simulations/abc")
+
+    for size in range(Snapshot.HEADER.itemsize, len(buffer)):
+        with pytest.raises(ValueError, match="truncated"):
+            Snapshot.decode(buffer[:size])
+
+def test_bad_magic_and_version():
+    buffer = bytearray(Snapshot.encode(SNAPSHOT))
+
+    with pytest.raises(ValueError, match="Not a binary snapshot"):
+        Snapshot.decode(b"XXXX" + bytes(buffer[4:]))
+
+    buffer[4:6] = np.uint16(Snapshot.VERSION + 1).astype("<u2").tobytes()
+    with pytest.raises(ValueError, match="Unknown snapshot version"):
+        Snapshot.decode(bytes(buffer))
+
+def test_unknown_ids_get_new_rows():
+    store = EntityStore()
+    first = store.load(Snapshot.decode(Snapshot.encode(SNAPSHOT))["robots"])
+
+    moved = dict(SNAPSHOT, robots=[
+        {"id": 4, "pos": [3, 3], "orientation": 1, "dx": 0, "dy": 0, "counter": 1},
+        {"id": 99, "pos": [9, 9], "orientation": 2, "dx": 0, "dy": 0, "counter": 0},
+    ])
+    rows = store.load(Snapshot.decode(Snapshot.encode(moved))["robots"])
+
+    assert rows[0] == first[1]
+    assert rows[1] == 2 and len(store) == 3
+    assert store.pos[rows].tolist() == [[3, 3], [9, 9]]
+    assert store.ids[:len(store)].tolist() == [11, 4, 99]
+
+JULIA_SCRIPT = """
+include("snapshot.jl")
+robots = [(id=11, pos=(1, 2), orientation=3, dx=-1, dy=0, counter=7),
+          (id=4, pos=(79, 0), orientation=0, dx=0, dy=1, counter=0)]
+boxes = [(id=20, pos=(5, 6), status=1), (id=21, pos=(7, 8), status=-1)]
+storages = [(id=30, pos=(0, 79))]
+write(stdout, encode_snapshot(robots, boxes, storages; location="/simulations/abc"))
+"""
+
+@pytest.mark.skipif(shutil.which("julia") is None, reason="julia no está instalado")
+def test_julia_encoder_matches():
+    output = subprocess.run(
+        ["julia", "--startup-file=no", "-e", JULIA_SCRIPT],
+        cwd=HERE, check=True, capture_output=True
+    ).stdout
+    snapshot = Snapshot.decode(output)
+
+    assert output == Snapshot.encode(SNAPSHOT, location="/simulations/abc")
+    assert snapshot["robots"]["ids"].tolist() == [11, 4]
+    assert snapshot["boxes"]["status"].tolist() == [STATUS_TAKEN, STATUS_UNKNOWN]
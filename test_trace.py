@@ -0,0 +1,144 @@
+import os
+
+import pytest
+
+import Snapshot
+from EntityStore import EntityStore
+from Trace import ALIGN, MAGIC, TraceReader, TraceWriter
+
+def snapshot(step):
+    return {
+        "robots": [
+            {"id": 11, "pos": [step, 2], "orientation": step % 4, "dx": 1, "dy": 0, "counter": step},
+            {"id": 4, "pos": [5, 2 * step], "orientation": 0, "dx": 0, "dy": -1, "counter": 0},
+        ],
+        "boxes": [
+            {"id": 20, "pos": [5, 6], "status": "waiting" if step < 2 else "taken"},
+            {"id": 21, "pos": [7, 8], "status": "lost"},
+        ],
+        "storages": [{"id": 30, "pos": [0, 79]}],
+    }
+
+def record(path, snapshots, flushEvery=64):
+    with TraceWriter(path, flushEvery=flushEvery) as writer:
+        for snap in snapshots:
+            writer.write(snap)
+    return TraceReader(path)
+
+def test_round_trip(tmp_path):
+    snapshots = [snapshot(step) for step in range(5)]
+    reader = record(str(tmp_path / "run.trace"), snapshots, flushEvery=2)
+
+    assert len(reader) == 5
+    for step, snap in enumerate(snapshots):
+        expected = dict(snap, boxes=[
+            dict(box, status="unknown" if box["status"] == "lost" else box["status"])
+            for box in snap["boxes"]
+        ])
+        assert reader.snapshot(step) == expected
+    assert reader[3]["robot_counter"].tolist() == [3, 0]
+    reader.close()
+
+def test_records_start_aligned(tmp_path):
+    path = str(tmp_path / "run.trace")
+    reader = record(path, [snapshot(0)])
+
+    size = os.path.getsize(path)
+    assert (size - reader.dtype.itemsize) % ALIGN == 0
+    assert reader.records.offset % ALIGN == 0
+
+def test_binary_snapshots_and_reordered_ids(tmp_path):
+    first = snapshot(0)
+    later = snapshot(1)
+    later["robots"].reverse()
+    binary = Snapshot.decode(Snapshot.encode(later))
+    reader = record(str(tmp_path / "run.trace"), [first, binary])
+
+    # Las columnas siguen el orden de ids del primer snapshot
+    assert reader.snapshot(1)["robots"] == snapshot(1)["robots"]
+    store = EntityStore()
+    store.loadArrays(reader.ids["robots"], reader[1]["robot_pos"])
+    assert store.pos[:len(store)].tolist() == [[1, 2], [5, 2]]
+
+def test_columns_match_snapshot(tmp_path):
+    reader = record(str(tmp_path / "run.trace"), [snapshot(step) for step in range(3)])
+    columns = reader.columns(2)
+
+    fromColumns, fromDicts = EntityStore(), EntityStore()
+    for kind in ("robots", "boxes", "storages"):
+        rows = fromColumns.load(columns[kind])
+        assert rows.tolist() == fromDicts.load(reader.snapshot(2)[kind]).tolist()
+    for name in ("ids", "pos", "orientation", "dx", "dy", "counter", "status"):
+        assert getattr(fromColumns, name).tolist() == getattr(fromDicts, name).tolist()
+
+    # Las columnas se vuelven a grabar igual que los dicts
+    copy = record(str(tmp_path / "copy.trace"), [columns])
+    assert copy[0].tobytes() == reader[2].tobytes()
+
+def test_unknown_id(tmp_path):
+    later = snapshot(1)
+    later["robots"][1]["id"] = 99
+
+    with TraceWriter(str(tmp_path / "run.trace")) as writer:
+        writer.write(snapshot(0))
+        with pytest.raises(ValueError, match="Unknown robots id in trace snapshot: 99"):
+            writer.write(later)
+
+def test_missing_agent(tmp_path):
+    later = snapshot(1)
+    del later["boxes"][0]
+
+    with TraceWriter(str(tmp_path / "run.trace")) as writer:
+        writer.write(snapshot(0))
+        with pytest.raises(ValueError, match="Trace expects 2 boxes, got 1"):
+            writer.write(later)
+
+def test_truncated_record_is_ignored(tmp_path):
+    path = str(tmp_path / "run.trace")
+    itemsize = record(path, [snapshot(step) for step in range(3)]).dtype.itemsize
+
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - itemsize // 2)
+    reader = TraceReader(path)
+
+    assert len(reader) == 2
+    assert reader.snapshot(1)["robots"] == snapshot(1)["robots"]
+    with pytest.raises(IndexError):
+        reader[2]
+
+def test_header_only(tmp_path):
+    path = str(tmp_path / "run.trace")
+    with TraceWriter(path) as writer:
+        writer.start(snapshot(0))
+
+    reader = TraceReader(path)
+    assert len(reader) == 0
+    assert reader.ids["boxes"].tolist() == [20, 21]
+
+@pytest.mark.parametrize("size", [len(MAGIC), len(MAGIC) + 2, len(MAGIC) + 10])
+def test_truncated_header(tmp_path, size):
+    path = str(tmp_path / "run.trace")
+    record(path, [snapshot(0)])
+    with open(path, "r+b") as f:
+        f.truncate(size)
+
+    with pytest.raises(ValueError, match="Trace header truncated"):
+        TraceReader(path)
+
+def test_not_a_trace(tmp_path):
+    path = tmp_path / "run.trace"
+    path.write_bytes(b"AMZS" + bytes(60))
+
+    with pytest.raises(ValueError, match="Not a trace file"):
+        TraceReader(str(path))
+
+def test_unknown_version(tmp_path):
+    path = str(tmp_path / "run.trace")
+    record(path, [snapshot(0)])
+    with open(path, "r+b") as f:
+        data = f.read()
+        f.seek(0)
+        f.write(data.replace(b'"version": 1', b'"version": 9', 1))
+
+    with pytest.raises(ValueError, match="Unknown trace version: 9"):
+        TraceReader(path)
@@ -0,0 +1,150 @@
+import gc
+import random
+
+import pytest
+
+from py3dbp import (
+    Packer, Bin, Item, PackingCache, PackingStats, PivotStrategy, pack_orders
+)
+from py3dbp.batch import pack_order
+
+SEEDS = range(40)
+
+
+def make_order(seed, bins=(1, 3), items=(1, 20)):
+    rng = random.Random(seed)
+    bin_specs = [
+        (
+            'bin{}'.format(index),
+            *[rng.choice([5, 7.5, 10, 12.25]) for _ in range(3)],
+            rng.choice([50, 200])
+        )
+        for index in range(rng.randint(*bins))
+    ]
+    item_specs = [
+        (
+            'item{}'.format(index),
+            *[rng.choice([1, 2, 2.5, 3.333, 4]) for _ in range(3)],
+            rng.randint(1, 20)
+        )
+        for index in range(rng.randint(*items))
+    ]
+    return bin_specs, item_specs
+
+
+def build(order, **packer_options):
+    bin_specs, item_specs = order
+    packer = Packer(**packer_options)
+    for spec in bin_specs:
+        packer.add_bin(Bin(*spec))
+    for spec in item_specs:
+        packer.add_item(Item(*spec))
+    return packer
+
+
+def layout(packer):
+    return (
+        [bin.string() for bin in packer.bins],
+        [
+            [item.string() for item in bin.items] +
+            ['unfitted ' + item.name for item in bin.unfitted_items]
+            for bin in packer.bins
+        ],
+        [item.name for item in packer.items],
+    )
+
+
+def pack(order, **pack_options):
+    packer = build(order)
+    packer.pack(**pack_options)
+    return layout(packer)
+
+
+@pytest.mark.parametrize('pivot_strategy', PivotStrategy.ALL)
+@pytest.mark.parametrize('distribute_items', [False, True])
+def test_fixed_point_matches_decimal(pivot_strategy, distribute_items):
+    for seed in SEEDS:
+        order = make_order(seed)
+        options = dict(
+            pivot_strategy=pivot_strategy, distribute_items=distribute_items
+        )
+        assert (
+            pack(order, fixed_point=True, **options) ==
+            pack(order, **options)
+        ), seed
+
+
+@pytest.mark.parametrize('pivot_strategy', PivotStrategy.ALL)
+@pytest.mark.parametrize('fixed_point', [False, True])
+def test_vectorized_matches_scalar(pivot_strategy, fixed_point):
+    for seed in SEEDS:
+        order = make_order(seed)
+        options = dict(pivot_strategy=pivot_strategy, fixed_point=fixed_point)
+        assert (
+            pack(order, vectorized=True, **options) == pack(order, **options)
+        ), seed
+
+
+@pytest.mark.parametrize('distribute_items', [False, True])
+def test_cache_hit_matches_pack(distribute_items):
+    cache = PackingCache()
+
+    for seed in SEEDS:
+        order = make_order(seed)
+        expected = pack(order, distribute_items=distribute_items)
+
+        for _ in range(2):
+            packer = build(order, cache=cache)
+            packer.pack(distribute_items=distribute_items)
+            assert layout(packer) == expected, seed
+
+    assert cache.hits == len(SEEDS)
+    assert cache.misses == len(SEEDS)
+
+
+def test_cache_keeps_untouched_positions():
+    cache = PackingCache()
+    order = (
+        [('small', 2, 2, 2, 100)],
+        [('fits', 1, 1, 1, 1), ('too big', 3, 3, 3, 1)]
+    )
+    build(order, cache=cache).pack()
+
+    packer = build(order, cache=cache)
+    packer.pack()
+
+    assert cache.hits == 1
+    assert packer.bins[0].unfitted_items[0].position == [0, 0, 0]
+
+
+def test_parallel_bins_match_serial():
+    for seed in SEEDS[:10]:
+        order = make_order(seed, bins=(2, 4))
+        assert pack(order, max_workers=2) == pack(order), seed
+
+
+def test_pack_orders_matches_serial():
+    orders = [make_order(seed) for seed in SEEDS[:10]]
+    options = dict(fixed_point=True, pivot_strategy=PivotStrategy.EXTREME_POINTS)
+
+    assert pack_orders(orders, max_workers=2, chunksize=3, **options) == [
+        pack_order(order, options) for order in orders
+    ]
+
+
+def test_stats_count_items_with_the_same_name_apart():
+    stats = PackingStats()
+    packer = Packer(stats=stats)
+    packer.add_bin(Bin('bin', 10, 10, 10, 100))
+    for _ in range(3):
+        packer.add_item(Item('box', 2, 2, 2, 1))
+    packer.pack()
+
+    counters = stats.as_dict()
+    assert [item['name'] for item in counters['items']] == ['box'] * 3
+    assert [item['placements'] for item in counters['items']] == [1, 1, 1]
+
+    del packer
+    gc.collect()
+    assert len(stats.items) == len(stats.bins) == 0
+    assert stats.totals.placements == 3
@@ -1,10 +1,26 @@
 include("storage.jl")
+include("snapshot.jl")
 using Genie, Genie.Renderer.Json, Genie.Requests, HTTP
 using UUIDs
 
 # Diccionario para almacenar instancias de simulación
 instances = Dict()
 
+# Formato binario opcional de los snapshots (?format=binary o Accept: BINARY_TYPE),
+# codificado por encode_snapshot de snapshot.jl.
+const BINARY_TYPE = "application/octet-stream"
+
+function wants_binary()
+    format = string(Genie.Requests.getpayload(:format, ""))
+    accept = HTTP.header(Genie.Requests.request(), "Accept", "")
+    return lowercase(format) == "binary" || occursin(BINARY_TYPE, accept)
+end
+
+binary_response(body) = HTTP.Response(200, [
+    "Content-Type" => BINARY_TYPE,
+    "Access-Control-Allow-Origin" => "*",
+], body)
+
 # Ruta para iniciar una nueva simulación
 route("/simulations", method=POST) do
     payload = jsonpayload()
@@ -30,6 +46,10 @@ route("/simulations", method=POST) do
         end
     end
 
+    if wants_binary()
+        return binary_response(encode_snapshot(robots, boxes, storages; location="/simulations/$id"))
+    end
+
     # Retorna los detalles de la simulación con el ID y agentes de la simulación
     json(Dict(:msg => "Simulación iniciada", "Location" => "/simulations/$id", "boxes" => boxes, "robots" => robots, "storages" => storages))
 end
@@ -54,6 +74,10 @@ route("/simulations/:id", method=GET) do
         end
     end
 
+    if wants_binary()
+        return binary_response(encode_snapshot(robots, boxes, storages))
+    end
+
     # Retorna el estado actualizado de la simulación
     json(Dict(:msg => "Paso de simulación completado", "boxes" => boxes, "robots" => robots, "storages" => storages))
 end